@@ -0,0 +1,119 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'catalog:version'
+HITS_KEY = 'catalog:hits'
+MISSES_KEY = 'catalog:misses'
+CHANGED_KEY = 'catalog:changed'
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def get_version():
+    cache = get_cache()
+    cache.add(VERSION_KEY, 1, timeout=None)
+    return cache.get(VERSION_KEY, 1)
+
+
+def invalidate_catalog():
+    """Сбрасывает все закешированные ответы каталога сменой версии ключей."""
+    cache = get_cache()
+    if not cache.add(VERSION_KEY, 2, timeout=None):
+        cache.incr(VERSION_KEY)
+    if settings.DATABASE_REPLICAS:
+        cache.set(CHANGED_KEY, True, settings.REPLICA_PIN_SECONDS)
+
+
+def changed_recently():
+    """Каталог менялся за последние REPLICA_PIN_SECONDS секунд,
+    и реплики могли ещё не получить изменения.
+    """
+    return get_cache().get(CHANGED_KEY) is not None
+
+
+def collection_key(model, parent_id):
+    return 'changed:{}:{}'.format(model._meta.model_name, parent_id)
+
+
+def get_changed_at(key):
+    """Время последней правки коллекции.
+
+    Если ключа нет (ещё не было правок или он вытеснен), им становится
+    текущее время: прежние валидаторы после этого не совпадут.
+    """
+    cache = get_cache()
+    now = time.time()
+    cache.add(key, now, timeout=None)
+    return cache.get(key, now)
+
+
+def touch_collection(key):
+    get_cache().set(key, time.time(), timeout=None)
+
+
+def count(key):
+    cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        'hits': cache.get(HITS_KEY, 0),
+        'misses': cache.get(MISSES_KEY, 0),
+    }
+
+
+def get_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.is_superuser:
+        return 'superuser'
+    return user.role
+
+
+class CachedReadMixin:
+    """Кеширует данные ответов на GET-запросы списка и объекта.
+
+    Ключ строится по адресу запроса с параметрами и роли пользователя,
+    а версия ключей сбрасывается сигналами при изменении каталога.
+    """
+    cache_anonymous_only = False
+
+    def get_cache_key(self, request):
+        url = request.build_absolute_uri().encode()
+        return 'catalog:{}:{}:{}'.format(
+            get_version(),
+            get_role(request.user),
+            hashlib.md5(url).hexdigest()
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if self.cache_anonymous_only and request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            count(HITS_KEY)
+            return Response(data)
+        count(MISSES_KEY)
+        response = self.fetch_response(handler, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+    def fetch_response(self, handler, request, *args, **kwargs):
+        """Ответ при промахе, который затем попадёт в кеш."""
+        return handler(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
@@ -0,0 +1,58 @@
+from django.core.signals import request_started
+from django.db import connections
+from django.dispatch import receiver
+
+
+class HealthCheckMixin:
+    """Проверка постоянного соединения при первом обращении к базе
+    за запрос, как CONN_HEALTH_CHECKS в Django 4.1.
+    """
+    health_check_done = True
+
+    def close_if_health_check_failed(self):
+        if self.health_check_done:
+            return
+        self.health_check_done = True
+        if (self.connection is not None and not self.in_atomic_block
+                and not self.is_usable()):
+            self.close()
+
+    # ensure_connection не подходит: его зовёт и close_old_connections
+    # в конце каждого запроса, даже не обращавшегося к базе.
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
+
+    def set_autocommit(self, *args, **kwargs):
+        self.close_if_health_check_failed()
+        return super().set_autocommit(*args, **kwargs)
+
+
+checked_classes = {}
+
+
+def with_health_checks(connection):
+    """Подмешивает HealthCheckMixin к классу соединения один раз."""
+    wrapper_class = type(connection)
+    if issubclass(wrapper_class, HealthCheckMixin):
+        return
+    if wrapper_class not in checked_classes:
+        checked_classes[wrapper_class] = type(
+            wrapper_class.__name__, (HealthCheckMixin, wrapper_class), {})
+    connection.__class__ = checked_classes[wrapper_class]
+
+
+@receiver(request_started)
+def check_persistent_connections(**kwargs):
+    """Откладывает проверку открытых соединений до их первого использования.
+
+    Соединение, которое закрыли PostgreSQL или пулер, пока оно простаивало,
+    закрывается перед первым запросом к базе, и Django открывает новое
+    вместо ошибки в обработчике. Запрос, отданный из кеша, и соединения
+    с неиспользованными репликами база не видит.
+    """
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict.get('CONN_HEALTH_CHECKS')):
+            with_health_checks(connection)
+            connection.health_check_done = False
@@ -0,0 +1,71 @@
+import csv
+import json
+
+from reviews.models import Title
+
+CHUNK_SIZE = 2000
+
+FIELDS = ('id', 'name', 'year', 'description', 'category', 'genre',
+          'rating')
+
+
+def with_genres(chunk):
+    """Добавляет slug жанров к пачке произведений одним запросом."""
+    genres = {}
+    links = Title.genre.through.objects.filter(
+        title_id__in=[row['id'] for row in chunk]
+    ).order_by('genre__slug').values_list('title_id', 'genre__slug')
+    for title_id, slug in links:
+        genres.setdefault(title_id, []).append(slug)
+    for row in chunk:
+        rating_sum = row.pop('rating_sum')
+        rating_count = row.pop('rating_count')
+        row['category'] = row.pop('category__slug')
+        row['genre'] = genres.get(row['id'], [])
+        row['rating'] = rating_sum / rating_count if rating_count else None
+        yield row
+
+
+def iter_titles(chunk_size=CHUNK_SIZE):
+    """Произведения с категорией, жанрами и рейтингом при постоянной памяти.
+
+    Строки читаются через iterator(), жанры подгружаются на каждую пачку
+    из chunk_size произведений.
+    """
+    titles = Title.objects.order_by('pk').values(
+        'id', 'name', 'year', 'description', 'category__slug',
+        'rating_sum', 'rating_count'
+    ).iterator(chunk_size=chunk_size)
+    chunk = []
+    for row in titles:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield from with_genres(chunk)
+            chunk = []
+    yield from with_genres(chunk)
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    """Буфер для csv.writer, который сразу отдаёт записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(FIELDS)
+    for row in rows:
+        row['genre'] = ','.join(row['genre'])
+        yield writer.writerow([row[field] for field in FIELDS])
+
+
+RENDERERS = {
+    'ndjson': (render_ndjson, 'application/x-ndjson'),
+    'csv': (render_csv, 'text/csv'),
+}
@@ -5,11 +5,11 @@ from reviews.models import Title
 class TitleFilter(filters.FilterSet):
     category = filters.CharFilter(
         field_name='category__slug',
-        lookup_expr='icontains'
+        lookup_expr='exact'
     )
     genre = filters.CharFilter(
         field_name='genre__slug',
-        lookup_expr='icontains'
+        lookup_expr='exact'
     )
     name = filters.CharFilter(
         field_name='name',
@@ -17,9 +17,17 @@ class TitleFilter(filters.FilterSet):
     )
     year = filters.NumberFilter(
         field_name='year',
-        lookup_expr='icontains'
+        lookup_expr='exact'
+    )
+    year_min = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='gte'
+    )
+    year_max = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='lte'
     )
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('search_vector',)
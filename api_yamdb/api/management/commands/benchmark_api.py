@@ -0,0 +1,171 @@
+import json
+import platform
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+from api.throttling import TokenBucketThrottle
+from api.views import get_tokens_for_user
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from reviews.models import Genre, Review, Title
+from users.confirmation import confirmation_code_fields
+from users.models import User
+
+from .generate_data import BENCHMARK_ADMIN
+
+CODE = 'benchmark-code'
+
+
+@contextmanager
+def rollback():
+    """Изменения сценария откатываются, данные остаются прежними."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+@contextmanager
+def without_throttling():
+    rates = TokenBucketThrottle.THROTTLE_RATES
+    saved = dict(rates)
+    rates.update(dict.fromkeys(rates))
+    try:
+        yield
+    finally:
+        rates.update(saved)
+
+
+def percentile(timings, share):
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * share))]
+
+
+class Command(BaseCommand):
+    help = ('Замеряет сценарии API на данных generate_data: задержки p50/p99 '
+            'и число SQL-запросов. Результат сохраняется в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--output', default='benchmark.json')
+        parser.add_argument('--compare',
+                            help='JSON прошлого запуска для сравнения')
+
+    def handle(self, *args, **options):
+        admin = User.objects.filter(username=BENCHMARK_ADMIN).first()
+        title = Title.objects.order_by('-rating_count', 'pk').first()
+        if admin is None or title is None:
+            raise CommandError('Сначала создайте данные: generate_data')
+        self.admin = admin
+        self.title = title
+        self.review = Review.objects.filter(title=title).order_by(
+            '-pk').first()
+        self.genre = Genre.objects.order_by('pk').first()
+        self.client = Client()
+        self.auth = {'HTTP_AUTHORIZATION':
+                     f'Bearer {get_tokens_for_user(admin)["access"]}'}
+        results = {}
+        with without_throttling():
+            for name, (prepare, request) in self.get_scenarios().items():
+                results[name] = self.measure(prepare, request,
+                                             options['iterations'])
+                self.stdout.write(self.format(name, results[name]))
+        report = {
+            'created': timezone.now().isoformat(),
+            'iterations': options['iterations'],
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'data': {'titles': Title.objects.count(),
+                     'reviews': Review.objects.count(),
+                     'users': User.objects.count()},
+            'scenarios': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def get_scenarios(self):
+        """Пары (подготовка, запрос); замеряется только запрос."""
+        title_url = f'/api/v1/titles/{self.title.pk}'
+        get = self.client.get
+        post = self.client.post
+        return {
+            'title_list': (None, lambda number: get(
+                '/api/v1/titles/', **self.auth)),
+            'title_list_anonymous_cached': (None, lambda number: get(
+                '/api/v1/titles/')),
+            'title_filter': (None, lambda number: get(
+                '/api/v1/titles/', {'genre': self.genre.slug,
+                                    'year_min': 1990}, **self.auth)),
+            'title_detail': (None, lambda number: get(
+                f'{title_url}/', **self.auth)),
+            'reviews_page': (None, lambda number: get(
+                f'{title_url}/reviews/', {'page': 2}, **self.auth)),
+            'reviews_cursor': (None, lambda number: get(
+                f'{title_url}/reviews/', {'pagination': 'cursor'},
+                **self.auth)),
+            'comment_create': (None, lambda number: post(
+                f'{title_url}/reviews/{self.review.pk}/comments/',
+                {'text': 'Согласен'}, **self.auth)),
+            'signup': (None, lambda number: post(
+                '/api/v1/auth/signup/',
+                {'username': f'bench-signup-{number}',
+                 'email': f'bench-signup-{number}@bench.fake'})),
+            'token': (self.issue_code, lambda number: post(
+                '/api/v1/auth/token/',
+                {'username': BENCHMARK_ADMIN, 'confirmation_code': CODE})),
+        }
+
+    def issue_code(self, number):
+        User.objects.filter(pk=self.admin.pk).update(
+            **confirmation_code_fields(CODE))
+
+    def measure(self, prepare, request, iterations):
+        """Первый прогон прогревает кеши и не учитывается."""
+        timings = []
+        queries = []
+        statuses = set()
+        for number in range(iterations + 1):
+            with rollback():
+                if prepare is not None:
+                    prepare(number)
+                with CaptureQueriesContext(connection) as context:
+                    started = time.perf_counter()
+                    response = request(number)
+                    elapsed = time.perf_counter() - started
+            if number == 0:
+                continue
+            timings.append(elapsed * 1000)
+            queries.append(len(context))
+            statuses.add(response.status_code)
+        return {
+            'p50_ms': round(statistics.median(timings), 3),
+            'p99_ms': round(percentile(timings, 0.99), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'queries': statistics.median(queries),
+            'statuses': sorted(statuses),
+        }
+
+    def format(self, name, result):
+        return (f'{name}: p50 {result["p50_ms"]:.2f} мс, '
+                f'p99 {result["p99_ms"]:.2f} мс, '
+                f'SQL {result["queries"]}, ответы {result["statuses"]}')
+
+    def compare(self, path, results):
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)['scenarios']
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]
+            self.stdout.write(
+                f'{name}: p50 {before["p50_ms"]:.2f} -> '
+                f'{result["p50_ms"]:.2f} мс '
+                f'({(result["p50_ms"] / before["p50_ms"] - 1) * 100:+.0f}%), '
+                f'SQL {before["queries"]} -> {result["queries"]}')
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает запросы/с при новом соединении с базой на каждый '
+            'запрос (CONN_MAX_AGE=0) и при постоянном соединении.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--max-age', type=int, default=60)
+
+    def handle(self, *args, **options):
+        saved = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            results = [
+                (max_age, self.run(max_age, options['requests']))
+                for max_age in (0, options['max_age'])
+            ]
+        finally:
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = saved
+        for max_age, rate in results:
+            self.stdout.write(f'CONN_MAX_AGE={max_age}: {rate:.0f} запросов/с')
+        self.stdout.write(f'Ускорение: {results[1][1] / results[0][1]:.2f}×')
+
+    def run(self, max_age, requests):
+        """Цикл запроса, как у WSGIHandler: сигналы начала и конца
+        закрывают устаревшие соединения, между ними выполняются
+        подсчёт и выборка страницы произведений.
+        """
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started.send(sender=self.__class__)
+            Title.objects.count()
+            list(Title.objects.order_by('pk').values_list('pk', 'name')[:5])
+            request_finished.send(sender=self.__class__)
+        return requests / (time.perf_counter() - started)
@@ -0,0 +1,70 @@
+import io
+import time
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import ReviewSerializer, TitleReadSerializer
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время рендера и разбора страниц TitleReadSerializer '
+            'и ReviewSerializer стандартным JSONRenderer/JSONParser и '
+            'FastJSONRenderer/FastJSONParser, проверяя равенство байт.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--iterations', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson не установлен, сравнивать не с чем')
+        size = options['page_size']
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre').order_by('pk')[:size]
+        reviews = Review.objects.select_related('author').order_by(
+            'pk')[:size]
+        pages = {
+            'titles': TitleReadSerializer(titles, many=True).data,
+            'reviews': ReviewSerializer(reviews, many=True).data,
+        }
+        if not pages['titles']:
+            raise CommandError('Нет произведений, запустите generate_data')
+        for name, data in pages.items():
+            self.compare(name, data, options['iterations'])
+
+    def compare(self, name, data, iterations):
+        page = {'count': len(data), 'next': None, 'previous': None,
+                'results': data}
+        body = JSONRenderer().render(page)
+        if FastJSONRenderer().render(page) != body:
+            raise CommandError(f'{name}: вывод рендереров различается')
+        if FastJSONParser().parse(io.BytesIO(body)) != JSONParser().parse(
+                io.BytesIO(body)):
+            raise CommandError(f'{name}: результат разбора различается')
+        results = []
+        for renderer, parser in ((JSONRenderer(), JSONParser()),
+                                 (FastJSONRenderer(), FastJSONParser())):
+            render = self.measure(lambda: renderer.render(page), iterations)
+            parse = self.measure(lambda: parser.parse(io.BytesIO(body)),
+                                 iterations)
+            results.append((render, parse))
+            self.stdout.write(
+                f'{name} ({len(data)} записей, {len(body)} байт) '
+                f'{type(renderer).__name__}: рендер {render * 1e6:.0f} мкс, '
+                f'{type(parser).__name__}: разбор {parse * 1e6:.0f} мкс'
+            )
+        (render, parse), (fast_render, fast_parse) = results
+        self.stdout.write(
+            f'{name}: рендер быстрее в {render / fast_render:.1f}×, '
+            f'разбор в {parse / fast_parse:.1f}×'
+        )
+
+    def measure(self, call, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        return (time.perf_counter() - started) / iterations
@@ -0,0 +1,44 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from reviews.models import Title
+from reviews.search import search_titles, uses_postgres
+
+
+def icontains_titles(text):
+    """Прежний путь: icontains по произведениям и тексту отзывов."""
+    return Title.objects.filter(
+        Q(name__icontains=text)
+        | Q(description__icontains=text)
+        | Q(reviews__text__icontains=text)
+    ).distinct()
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает полнотекстовый поиск с поиском через icontains.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('query')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def measure(self, search, text, repeat):
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        list(search(text)[:page_size])
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(search(text)[:page_size])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), max(timings)
+
+    def handle(self, *args, **options):
+        engine = 'PostgreSQL tsvector' if uses_postgres() else 'in-process'
+        for name, search in ((engine, search_titles),
+                             ('icontains', icontains_titles)):
+            median, worst = self.measure(search, options['query'],
+                                         options['repeat'])
+            self.stdout.write(
+                f'{name}: медиана {median:.2f} мс, максимум {worst:.2f} мс')
@@ -0,0 +1,23 @@
+from api.export import CHUNK_SIZE, RENDERERS, iter_titles
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Выгружает произведения с категорией, жанрами и рейтингом.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', choices=tuple(RENDERERS),
+                            default='ndjson')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--file',
+                            help='Путь к файлу, по умолчанию stdout.')
+
+    def handle(self, *args, **options):
+        render, _ = RENDERERS[options['output']]
+        lines = render(iter_titles(options['chunk_size']))
+        if not options['file']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['file'], 'w', encoding='utf-8', newline='') as file:
+            file.writelines(lines)
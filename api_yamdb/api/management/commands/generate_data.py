@@ -0,0 +1,137 @@
+import random
+from datetime import timedelta
+
+from api.cache import invalidate_catalog
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import rebuild_ratings
+from reviews.search import fill_search_vectors
+from users.models import User
+
+from .import_yamdb import keep_pub_date
+
+BATCH_SIZE = 2000
+
+WORDS = ('дом', 'море', 'ночь', 'город', 'война', 'любовь', 'звезда',
+         'дорога', 'тайна', 'лето', 'зима', 'река', 'сердце', 'время')
+
+BENCHMARK_ADMIN = 'bench-admin'
+
+
+class Command(BaseCommand):
+    help = ('Создаёт синтетический каталог для нагрузочных тестов. '
+            'Один и тот же --seed даёт одни и те же данные.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=5000)
+        parser.add_argument('--reviews', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        if Title.objects.exists() or User.objects.filter(
+                username=BENCHMARK_ADMIN).exists():
+            raise CommandError('Каталог не пуст, нужна чистая база')
+        if options['reviews'] > options['users'] * options['titles']:
+            raise CommandError('Отзывов больше, чем пар автор-произведение')
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+        with transaction.atomic():
+            user_ids = self.create_users(options['users'])
+            category_ids = self.create(Category, [
+                Category(name=f'Категория {number}', slug=f'category-{number}')
+                for number in range(options['categories'])
+            ])
+            genre_ids = self.create(Genre, [
+                Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+                for number in range(options['genres'])
+            ])
+            title_ids = self.create_titles(options['titles'], category_ids,
+                                           genre_ids)
+            with keep_pub_date(Review), keep_pub_date(Comment):
+                review_ids = self.create_reviews(options['reviews'],
+                                                 user_ids, title_ids)
+                self.create_comments(options['comments'], user_ids,
+                                     review_ids)
+            rebuild_ratings()
+            fill_search_vectors()
+        invalidate_catalog()
+        self.stdout.write(
+            f'Создано: {len(user_ids)} пользователей, '
+            f'{len(title_ids)} произведений, {len(review_ids)} отзывов')
+
+    def bulk_create(self, model, objects):
+        """bulk_create пачками не больше, чем допускает база."""
+        fields = [field for field in model._meta.concrete_fields
+                  if not field.primary_key]
+        batch_size = min(BATCH_SIZE,
+                         connection.ops.bulk_batch_size(fields, objects))
+        model.objects.bulk_create(objects, batch_size=max(batch_size, 1))
+
+    def create(self, model, objects):
+        self.bulk_create(model, objects)
+        return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+    def text(self, words):
+        return ' '.join(self.random.choice(WORDS) for _ in range(words))
+
+    def pub_date(self):
+        return self.now - timedelta(seconds=self.random.randrange(
+            365 * 24 * 60 * 60))
+
+    def create_users(self, count):
+        password = make_password(None)
+        users = [User(username=BENCHMARK_ADMIN, email='admin@bench.fake',
+                      role='admin', password=password)]
+        users += [
+            User(username=f'bench-{number}',
+                 email=f'bench-{number}@bench.fake', password=password)
+            for number in range(count - 1)
+        ]
+        return self.create(User, users)
+
+    def create_titles(self, count, category_ids, genre_ids):
+        title_ids = self.create(Title, [
+            Title(
+                name=self.text(3).capitalize(),
+                year=self.random.randint(1900, self.now.year),
+                description=self.text(20),
+                category_id=self.random.choice(category_ids)
+            )
+            for _ in range(count)
+        ])
+        self.bulk_create(Title.genre.through, [
+            Title.genre.through(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in self.random.sample(
+                genre_ids, min(len(genre_ids), self.random.randint(1, 3)))
+        ])
+        return title_ids
+
+    def create_reviews(self, count, user_ids, title_ids):
+        pairs = set()
+        while len(pairs) < count:
+            pairs.add((self.random.choice(title_ids),
+                       self.random.choice(user_ids)))
+        return self.create(Review, [
+            Review(title_id=title_id, author_id=author_id,
+                   text=self.text(30), score=self.random.randint(1, 10),
+                   pub_date=self.pub_date())
+            for title_id, author_id in sorted(pairs)
+        ])
+
+    def create_comments(self, count, user_ids, review_ids):
+        if not review_ids:
+            return
+        self.create(Comment, [
+            Comment(review_id=self.random.choice(review_ids),
+                    author_id=self.random.choice(user_ids),
+                    text=self.text(10), pub_date=self.pub_date())
+            for _ in range(count)
+        ])
@@ -0,0 +1,219 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from api.cache import invalidate_catalog
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import rebuild_ratings
+from reviews.search import fill_search_vectors
+from users.models import User
+
+BATCH_SIZE = 1000
+
+FORMATS = ('csv', 'jsonl')
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        yield from csv.DictReader(file)
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+@contextmanager
+def keep_pub_date(model):
+    """Отключает auto_now_add, чтобы сохранить даты из файла."""
+    field = model._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def optional_id(row):
+    return {'id': int(row['id'])} if row.get('id') else {}
+
+
+class Command(BaseCommand):
+    help = ('Загружает данные каталога из CSV или JSON Lines пачками '
+            'bulk_create. Файлы ищутся в каталоге по именам: '
+            'category, genre, titles, genre_title, users, review, comments.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f'Каталог {directory} не найден')
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.category_ids = {}
+        self.genre_ids = {}
+        self.user_ids = {}
+        steps = (
+            ('category', Category, self.build_category),
+            ('genre', Genre, self.build_genre),
+            ('titles', Title, self.build_title),
+            ('genre_title', Title.genre.through, self.build_genre_title),
+            ('users', User, self.build_user),
+            ('review', Review, self.build_review),
+            ('comments', Comment, self.build_comment),
+        )
+        imported = []
+        for name, model, build in steps:
+            path = self.find_file(directory, name)
+            if path is None:
+                continue
+            self.load_maps(model)
+            if model in (Review, Comment):
+                with keep_pub_date(model):
+                    self.import_file(name, path, model, build)
+            else:
+                self.import_file(name, path, model, build)
+            imported.append(model)
+        if not imported:
+            raise CommandError(f'В каталоге {directory} нет файлов данных')
+        self.reset_sequences(imported)
+        if Review in imported:
+            rebuild_ratings()
+        fill_search_vectors()
+        invalidate_catalog()
+
+    def find_file(self, directory, name):
+        for extension in FORMATS:
+            path = os.path.join(directory, f'{name}.{extension}')
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load_maps(self, model):
+        """Словари slug/username -> id для связей, без загрузки объектов."""
+        if model is Title:
+            self.category_ids = dict(
+                Category.objects.values_list('slug', 'id'))
+        elif model is Title.genre.through:
+            self.genre_ids = dict(Genre.objects.values_list('slug', 'id'))
+        elif model in (Review, Comment) and not self.user_ids:
+            self.user_ids = dict(
+                User.objects.values_list('username', 'id').iterator())
+
+    def import_file(self, name, path, model, build):
+        reader = READERS[path.rsplit('.', 1)[1]]
+        started = time.monotonic()
+        total = 0
+        batch = []
+        for line, row in enumerate(reader(path), start=1):
+            try:
+                batch.append(build(row))
+            except (KeyError, ValueError) as error:
+                raise CommandError(f'{path}, запись {line}: {error!r}')
+            if len(batch) >= self.batch_size:
+                total += self.save_batch(model, batch)
+                batch = []
+        total += self.save_batch(model, batch)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{name}: {total} записей за {elapsed:.2f} с '
+            f'({total / elapsed if elapsed else total:.0f} записей/с)'
+        )
+
+    def save_batch(self, model, batch):
+        if not batch:
+            return 0
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+        except IntegrityError as error:
+            raise CommandError(
+                f'{model._meta.verbose_name_plural}: {error}')
+        return len(batch)
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def build_category(self, row):
+        return Category(name=row['name'], slug=row['slug'],
+                        **optional_id(row))
+
+    def build_genre(self, row):
+        return Genre(name=row['name'], slug=row['slug'], **optional_id(row))
+
+    def build_title(self, row):
+        category = row.get('category')
+        return Title(
+            name=row['name'],
+            year=int(row['year']),
+            category_id=self.category_ids[category] if category else None,
+            description=row.get('description') or None,
+            **optional_id(row)
+        )
+
+    def build_genre_title(self, row):
+        return Title.genre.through(
+            title_id=int(row['title']),
+            genre_id=self.genre_ids[row['genre']]
+        )
+
+    def build_user(self, row):
+        return User(
+            username=row['username'],
+            email=row['email'],
+            role=row.get('role') or 'user',
+            bio=row.get('bio') or '',
+            first_name=row.get('first_name') or '',
+            last_name=row.get('last_name') or '',
+            password=make_password(None),
+            **optional_id(row)
+        )
+
+    def build_review(self, row):
+        return Review(
+            title_id=int(row['title']),
+            author_id=self.user_ids[row['author']],
+            text=row['text'],
+            score=int(row['score']),
+            pub_date=self.parse_pub_date(row),
+            **optional_id(row)
+        )
+
+    def build_comment(self, row):
+        return Comment(
+            review_id=int(row['review']),
+            author_id=self.user_ids[row['author']],
+            text=row['text'],
+            pub_date=self.parse_pub_date(row),
+            **optional_id(row)
+        )
+
+    def parse_pub_date(self, row):
+        if not row.get('pub_date'):
+            return self.now
+        pub_date = parse_datetime(row['pub_date'])
+        if pub_date is None:
+            raise ValueError(f'неверная дата {row["pub_date"]}')
+        if timezone.is_aware(pub_date):
+            return pub_date
+        return timezone.make_aware(pub_date, timezone.utc)
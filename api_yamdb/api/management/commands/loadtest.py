@@ -0,0 +1,112 @@
+import http.client
+import socket
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(timings, share):
+    return timings[min(len(timings) - 1, int(len(timings) * share))]
+
+
+class Command(BaseCommand):
+    help = ('Нагружает запущенный сервер параллельными запросами '
+            'и печатает пропускную способность и задержки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('url')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument('--header', action='append', default=[],
+                            help='Заголовок вида "Имя: значение"')
+        parser.add_argument(
+            '--slow-clients', type=int, default=0,
+            help='Соединения, которые передают заголовки по одному '
+                 'в секунду до конца теста, как медленные мобильные клиенты'
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('Нужен адрес вида http://host:port/path')
+        self.address = (url.hostname, url.port or 80)
+        self.path = url.path + (f'?{url.query}' if url.query else '')
+        self.headers = dict(
+            header.split(':', 1) for header in options['header'])
+        self.deadline = time.monotonic() + options['duration']
+        self.timings = []
+        self.errors = 0
+        self.lock = threading.Lock()
+        threads = [threading.Thread(target=self.client)
+                   for _ in range(options['concurrency'])]
+        threads += [threading.Thread(target=self.slow_client)
+                    for _ in range(options['slow_clients'])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.report(time.monotonic() - started)
+
+    def client(self):
+        """Поток с постоянным соединением, как у nginx к upstream."""
+        connection = None
+        timings = []
+        errors = 0
+        while time.monotonic() < self.deadline:
+            if connection is None:
+                connection = http.client.HTTPConnection(*self.address,
+                                                        timeout=30)
+            started = time.perf_counter()
+            try:
+                connection.request('GET', self.path, headers=self.headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = None
+                errors += 1
+                continue
+            timings.append(time.perf_counter() - started)
+            if response.status >= 400:
+                errors += 1
+            if response.getheader('Connection') == 'close':
+                connection.close()
+                connection = None
+        with self.lock:
+            self.timings.extend(timings)
+            self.errors += errors
+
+    def slow_client(self):
+        """Держит соединение, отправляя запрос по заголовку в секунду.
+
+        В задержки и ошибки не попадает: важно, сколько таких соединений
+        сервер держит, не переставая отвечать обычным клиентам.
+        """
+        try:
+            with socket.create_connection(self.address, timeout=30) as sock:
+                sock.sendall(f'GET {self.path} HTTP/1.1\r\n'
+                             f'Host: {self.address[0]}\r\n'.encode())
+                while time.monotonic() < self.deadline:
+                    time.sleep(1)
+                    sock.sendall(b'X-Slow: 1\r\n')
+                sock.sendall(b'Connection: close\r\n\r\n')
+                sock.recv(1024)
+        except OSError:
+            pass
+
+    def report(self, elapsed):
+        if not self.timings:
+            raise CommandError(f'Нет ответов, ошибок: {self.errors}')
+        timings = sorted(timing * 1000 for timing in self.timings)
+        self.stdout.write(
+            f'{len(timings)} запросов за {elapsed:.1f} с, '
+            f'ошибок: {self.errors}\n'
+            f'{len(timings) / elapsed:.1f} запросов/с\n'
+            f'задержка: медиана {statistics.median(timings):.1f} мс, '
+            f'p95 {percentile(timings, 0.95):.1f} мс, '
+            f'p99 {percentile(timings, 0.99):.1f} мс'
+        )
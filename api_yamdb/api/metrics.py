@@ -0,0 +1,286 @@
+import logging
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+
+from .cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERIES = (0, 1, 2, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = {
+    'yamdb_request_duration_seconds': ('Время обработки запроса', SECONDS),
+    'yamdb_db_queries': ('Число SQL-запросов на запрос', QUERIES),
+    'yamdb_db_duration_seconds': ('Время SQL-запросов на запрос', SECONDS),
+    'yamdb_serialize_duration_seconds': (
+        'Время сериализации данных ответа', SECONDS),
+    'yamdb_render_duration_seconds': ('Время рендеринга ответа в JSON',
+                                      SECONDS),
+}
+
+WORKER_KEY = 'metrics:worker:{}'
+WORKERS_KEY = 'metrics:workers'
+WORKERS_LOCK_KEY = 'metrics:workers:lock'
+WORKERS_LOCK_TIMEOUT = 5
+TOP_STATEMENTS = 3
+
+
+class Timings(threading.local):
+    """Время to_representation сериализаторов текущего запроса в потоке."""
+    serialize = 0.0
+
+
+timings = Timings()
+timed_classes = {}
+
+
+def timed_serializer(serializer_class):
+    """Подкласс сериализатора, который засекает to_representation.
+
+    Для many=True ListSerializer вызывает to_representation дочернего
+    сериализатора на каждый объект, время складывается.
+    """
+    if serializer_class in timed_classes:
+        return timed_classes[serializer_class]
+
+    def to_representation(self, instance):
+        started = time.perf_counter()
+        try:
+            return super(timed, self).to_representation(instance)
+        finally:
+            timings.serialize += time.perf_counter() - started
+
+    timed = type(serializer_class.__name__, (serializer_class,), {
+        'to_representation': to_representation,
+        '__module__': serializer_class.__module__,
+    })
+    timed_classes[serializer_class] = timed
+    return timed
+
+
+class Registry:
+    """Гистограммы по эндпоинтам в памяти процесса.
+
+    Раз в METRICS_FLUSH_INTERVAL секунд процесс кладёт свой снимок в общий
+    кеш, а /metrics отдаёт снимки всех живых воркеров gunicorn отдельными
+    сериями с меткой worker. Складывать их должен Prometheus
+    (sum without (worker)): после перезапуска воркера его счётчики
+    начинаются с нуля, и только rate() по каждой серии это учитывает.
+    """
+
+    def __init__(self, worker=None):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.responses = Counter()
+        self.flushed = 0
+        self._worker = worker
+
+    def observe(self, endpoint, status, values):
+        with self.lock:
+            self.responses[(endpoint, status)] += 1
+            histograms = self.histograms.get(endpoint)
+            if histograms is None:
+                histograms = self.histograms[endpoint] = {
+                    name: [0] * (len(buckets) + 2)
+                    for name, (_, buckets) in HISTOGRAMS.items()
+                }
+            for name, value in values.items():
+                histogram = histograms[name]
+                histogram[bisect_left(HISTOGRAMS[name][1], value)] += 1
+                histogram[-1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'histograms': {
+                    endpoint: {name: list(histogram)
+                               for name, histogram in histograms.items()}
+                    for endpoint, histograms in self.histograms.items()
+                },
+                'responses': dict(self.responses),
+            }
+
+    @property
+    def worker(self):
+        """Имя воркера, pid берётся после fork."""
+        return self._worker or f'{socket.gethostname()}:{os.getpid()}'
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        interval = settings.METRICS_FLUSH_INTERVAL
+        if not force and now - self.flushed < interval:
+            return
+        self.flushed = now
+        cache = get_cache()
+        cache.set(WORKER_KEY.format(self.worker), self.snapshot(),
+                  interval * 3)
+        register_worker(cache, self.worker, interval * 3)
+
+
+registry = Registry()
+
+
+def register_worker(cache, worker, ttl):
+    """Отмечает воркер в общем списке под блокировкой в кеше.
+
+    Без блокировки два воркера, одновременно прочитавшие список,
+    затирали бы записи друг друга. Если блокировка занята, воркер
+    отметится при следующем сбросе: запись живёт втрое дольше интервала.
+    """
+    if not cache.add(WORKERS_LOCK_KEY, True, WORKERS_LOCK_TIMEOUT):
+        return
+    try:
+        now = time.time()
+        workers = cache.get(WORKERS_KEY, {})
+        workers[worker] = now
+        cache.set(WORKERS_KEY, {
+            name: seen for name, seen in workers.items()
+            if seen > now - ttl
+        }, None)
+    finally:
+        cache.delete(WORKERS_LOCK_KEY)
+
+
+def collect():
+    """Снимки живых воркеров по их именам."""
+    registry.flush(force=True)
+    cache = get_cache()
+    workers = sorted(cache.get(WORKERS_KEY, {}))
+    snapshots = cache.get_many([WORKER_KEY.format(name) for name in workers])
+    return {
+        name: snapshots[WORKER_KEY.format(name)] for name in workers
+        if WORKER_KEY.format(name) in snapshots
+    }
+
+
+def render(snapshots):
+    lines = [
+        '# HELP yamdb_responses_total Число ответов',
+        '# TYPE yamdb_responses_total counter',
+    ]
+    for worker, snapshot in snapshots.items():
+        for (endpoint, status), value in sorted(
+                snapshot['responses'].items()):
+            lines.append(f'yamdb_responses_total{{endpoint="{endpoint}",'
+                         f'status="{status}",worker="{worker}"}} {value}')
+    for name, (description, buckets) in HISTOGRAMS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} histogram')
+        for worker, snapshot in snapshots.items():
+            for endpoint, histograms in sorted(
+                    snapshot['histograms'].items()):
+                labels = f'endpoint="{endpoint}",worker="{worker}"'
+                values = histograms[name]
+                cumulative = 0
+                for bound, count in zip(buckets + ('+Inf',), values):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},'
+                                 f'le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{labels}}} {values[-1]:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    return HttpResponse(render(collect()),
+                        content_type='text/plain; version=0.0.4')
+
+
+def get_endpoint(request):
+    """Имя представления и действия, например TitleViewSet.list."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    view = getattr(match.func, 'cls', None)
+    if view is None:
+        return match.func.__name__
+    method = request.method.lower()
+    actions = getattr(match.func, 'actions', None) or {}
+    return f'{view.__name__}.{actions.get(method, method)}'
+
+
+class QueryRecorder:
+    """Обёртка execute_wrapper: число, время и текст SQL-запросов."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements.append(sql)
+
+
+class MetricsMiddleware:
+    """Собирает время ответа, число и время SQL-запросов, время
+    сериализации (с SerializeTimingMixin у view) и рендеринга по эндпоинтам
+    и пишет в журнал медленные запросы с самыми частыми повторами SQL.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.render_duration = 0.0
+        timings.serialize = 0.0
+        started = time.perf_counter()
+        # То же, что connection.execute_wrapper(), без затрат на генератор.
+        wrapped = connections.all()
+        for connection in wrapped:
+            connection.execute_wrappers.append(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(recorder)
+        duration = time.perf_counter() - started
+        endpoint = get_endpoint(request)
+        registry.observe(endpoint, response.status_code, {
+            'yamdb_request_duration_seconds': duration,
+            'yamdb_db_queries': recorder.count,
+            'yamdb_db_duration_seconds': recorder.duration,
+            'yamdb_serialize_duration_seconds': timings.serialize,
+            'yamdb_render_duration_seconds': request.render_duration,
+        })
+        registry.flush()
+        if duration >= settings.SLOW_REQUEST_THRESHOLD:
+            self.log_slow(request, endpoint, duration, recorder)
+        return response
+
+    def process_template_response(self, request, response):
+        """Засекает рендеринг ответа DRF в JSON, который идёт после view."""
+        started = time.perf_counter()
+
+        def finished(response):
+            request.render_duration += time.perf_counter() - started
+
+        response.add_post_render_callback(finished)
+        return response
+
+    def log_slow(self, request, endpoint, duration, recorder):
+        repeated = Counter(recorder.statements).most_common(TOP_STATEMENTS)
+        logger.warning(
+            'Медленный запрос %s %s (%s): %.3f с, SQL: %s за %.3f с\n%s',
+            request.method, request.get_full_path(), endpoint, duration,
+            recorder.count, recorder.duration,
+            '\n'.join(f'{count} × {sql}' for count, sql in repeated)
+        )
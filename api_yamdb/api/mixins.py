@@ -1,8 +1,141 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.viewsets import GenericViewSet
 
+from .cache import changed_recently, get_changed_at
+from .metrics import timed_serializer
+from .routers import is_pinned, use_primary, use_replica, using_replica
+
 
 class ModelMixinSet(CreateModelMixin, ListModelMixin,
                     DestroyModelMixin, GenericViewSet):
     pass
+
+
+class SerializeTimingMixin:
+    """Время сериализации попадает в метрику
+    yamdb_serialize_duration_seconds.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if not settings.METRICS_ENABLED:
+            return super().get_serializer(*args, **kwargs)
+        serializer_class = timed_serializer(self.get_serializer_class())
+        kwargs.setdefault('context', self.get_serializer_context())
+        return serializer_class(*args, **kwargs)
+
+
+class ReplicaReadMixin:
+    """Чтение через безопасные методы обслуживает реплика базы.
+
+    Аутентификация и проверки прав идут до переключения, а клиент,
+    недавно писавший в базу, читает с основной. С CachedReadMixin
+    ставится перед ним.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (settings.DATABASE_REPLICAS and request.method in SAFE_METHODS
+                and not is_pinned(request)):
+            use_replica()
+
+    def fetch_response(self, handler, request, *args, **kwargs):
+        """Кеш каталога после его изменения заполняется с основной базы.
+
+        Иначе страница с отстающей реплики прожила бы в кеше под новой
+        версией CATALOG_CACHE_TIMEOUT секунд.
+        """
+        if using_replica() and changed_recently():
+            use_primary()
+        return super().fetch_response(handler, request, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            use_primary()
+
+
+class ConditionalListMixin:
+    """ETag и Last-Modified для списка по дате последней записи, их числу
+    и времени последней правки коллекции.
+
+    Совпадение If-None-Match или If-Modified-Since даёт ответ 304
+    сразу после агрегирующего запроса, без выборки и сериализации.
+    В курсорном режиме агрегат по всей коллекции не считается:
+    валидаторы строятся по записям выбранной страницы, и 304
+    отдаётся без сериализации.
+    """
+    modified_field = 'pub_date'
+
+    def get_collection_key(self):
+        """Ключ времени правки коллекции, см. api.cache.touch_collection.
+
+        По умолчанию ключа нет, и валидаторы от правок не зависят.
+        """
+
+    def make_validators(self, request, last_modified, *parts):
+        timestamp = last_modified.timestamp() if last_modified else None
+        key = self.get_collection_key()
+        if key is not None:
+            timestamp = max(timestamp or 0, get_changed_at(key))
+        etag = hashlib.md5(':'.join(
+            map(str, (request.get_full_path(), *parts, timestamp))
+        ).encode()).hexdigest()
+        return quote_etag(etag), timestamp
+
+    def get_list_validators(self, request):
+        stats = self.filter_queryset(self.get_queryset()).aggregate(
+            last_modified=Max(self.modified_field),
+            count=Count('pk')
+        )
+        return self.make_validators(request, stats['last_modified'],
+                                    stats['count'])
+
+    def get_page_validators(self, request, page):
+        dates = [getattr(item, self.modified_field) for item in page]
+        return self.make_validators(
+            request, max(dates, default=None),
+            ','.join(str(item.pk) for item in page)
+        )
+
+    def is_cursor_mode(self, request):
+        paginator = self.paginator
+        return (paginator is not None and hasattr(paginator, 'is_cursor_mode')
+                and paginator.is_cursor_mode(request))
+
+    def conditional_response(self, request, validators, respond):
+        etag, timestamp = validators
+        last_modified = int(timestamp) if timestamp is not None else None
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+        response = respond()
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_cursor_mode(request):
+            return self.conditional_response(
+                request, self.get_list_validators(request),
+                lambda: super(ConditionalListMixin, self).list(
+                    request, *args, **kwargs)
+            )
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset()))
+        return self.conditional_response(
+            request, self.get_page_validators(request, page),
+            lambda: self.get_paginated_response(
+                self.get_serializer(page, many=True).data)
+        )
@@ -0,0 +1,139 @@
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+MAX_PAGE_SIZE = 100
+
+Cursor = namedtuple('Cursor', ['reverse', 'position', 'key'])
+
+
+class OptionalCursorPagination(CursorPagination):
+    """Курсорная пагинация по запросу клиента.
+
+    По умолчанию работает обычная постраничная пагинация. С параметром
+    ``?pagination=cursor`` (или с ``cursor`` из ссылок next/previous)
+    страницы выбираются по индексу без COUNT(*) и OFFSET.
+
+    Курсор хранит пару (поле сортировки, id) последней записи страницы,
+    поэтому записи с одинаковым значением поля листаются тоже по индексу,
+    а не смещением, как в CursorPagination DRF.
+    """
+    mode_query_param = 'pagination'
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    fallback_class = PageNumberPagination
+
+    def __init__(self):
+        self.fallback = None
+
+    def is_cursor_mode(self, request):
+        return (self.cursor_query_param in request.query_params
+                or request.query_params.get(self.mode_query_param)
+                == 'cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_mode(request):
+            return self.paginate_keyset(queryset, request)
+        self.fallback = self.fallback_class()
+        return self.fallback.paginate_queryset(queryset, request, view)
+
+    def paginate_keyset(self, queryset, request):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.field, self.key_field = self.ordering
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        if reverse:
+            queryset = queryset.order_by(f'-{self.field}',
+                                         f'-{self.key_field}')
+        else:
+            queryset = queryset.order_by(self.field, self.key_field)
+        if self.cursor is not None:
+            lookup = 'lt' if reverse else 'gt'
+            try:
+                queryset = queryset.filter(
+                    Q(**{f'{self.field}__{lookup}': self.cursor.position})
+                    | Q(**{self.field: self.cursor.position,
+                           f'{self.key_field}__{lookup}': self.cursor.key})
+                )
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        if self.has_next or self.has_previous:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return self.encode_cursor(self.cursor._replace(reverse=False))
+        return self.encode_cursor(self.get_cursor(self.page[-1], False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return self.encode_cursor(self.cursor._replace(reverse=True))
+        return self.encode_cursor(self.get_cursor(self.page[0], True))
+
+    def get_cursor(self, instance, reverse):
+        return Cursor(reverse=reverse,
+                      position=str(getattr(instance, self.field)),
+                      key=str(getattr(instance, self.key_field)))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(
+                b64decode(encoded.encode('ascii')).decode('ascii'),
+                keep_blank_values=True
+            )
+            return Cursor(reverse=tokens.get('r') == ['1'],
+                          position=tokens['p'][0],
+                          key=int(tokens['k'][0]))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': cursor.position, 'k': cursor.key}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        encoded = b64encode(
+            parse.urlencode(tokens).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   encoded)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.fallback is not None:
+            return self.fallback.to_html()
+        return super().to_html()
+
+
+class TitlePagination(OptionalCursorPagination):
+    ordering = ('year', 'id')
+
+
+class PubDatePagination(OptionalCursorPagination):
+    ordering = ('pub_date', 'id')
@@ -1,6 +1,22 @@
 from rest_framework import permissions
 
 
+def is_author_or_staff(request, obj):
+    """Чтение или правка автором, модератором и администратором.
+
+    Роль берётся из токена, а автор сравнивается по author_id,
+    поэтому ни пользователь, ни автор объекта не читаются из базы.
+    """
+    if request.method in permissions.SAFE_METHODS:
+        return True
+    user = request.user
+    return user.is_authenticated and (
+        user.role in ('admin', 'moderator')
+        or user.is_superuser
+        or obj.author_id == user.pk
+    )
+
+
 class Anonim(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
@@ -75,15 +91,7 @@ class RewiewPermission(permissions.BasePermission):
             or request.method in permissions.SAFE_METHODS)
 
     def has_object_permission(self, request, view, obj):
-        if (request.user.is_authenticated
-                and (obj.author == request.user
-                     or request.user.role == 'admin'
-                     or request.user.role == 'moderator'
-                     or request.user.is_superuser)):
-            return True
-        if request.method in permissions.SAFE_METHODS:
-            return True
-        return False
+        return is_author_or_staff(request, obj)
 
 
 class CommentPermission(permissions.BasePermission):
@@ -95,12 +103,4 @@ class CommentPermission(permissions.BasePermission):
         return None
 
     def has_object_permission(self, request, view, obj):
-        if (request.user.is_authenticated
-                and (obj.author == request.user
-                     or request.user.role == 'admin'
-                     or request.user.role == 'moderator'
-                     or request.user.is_superuser)):
-            return True
-        if request.method in permissions.SAFE_METHODS:
-            return True
-        return False
+        return is_author_or_staff(request, obj)
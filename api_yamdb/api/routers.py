@@ -0,0 +1,85 @@
+import random
+import threading
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from .cache import get_cache
+
+state = threading.local()
+
+
+def use_replica():
+    """Направляет чтение до конца запроса на одну из реплик."""
+    if settings.DATABASE_REPLICAS:
+        state.alias = random.choice(settings.DATABASE_REPLICAS)
+
+
+def use_primary():
+    state.alias = None
+
+
+def using_replica():
+    return getattr(state, 'alias', None) is not None
+
+
+def pin_key(request):
+    """Ключ закрепления: пользователь или, как в ограничении частоты,
+    адрес клиента с учётом NUM_PROXIES.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'replica:pin:user:{user.pk}'
+    return f'replica:pin:ip:{BaseThrottle().get_ident(request)}'
+
+
+def is_pinned(request):
+    return get_cache().get(pin_key(request)) is not None
+
+
+class ReplicaRouter:
+    """Чтение в запросах, где вызван use_replica(), идёт на реплику,
+    всё остальное и любая запись — на основную базу.
+
+    Реплики заполняются репликацией PostgreSQL, миграции на них не идут.
+    """
+
+    def db_for_read(self, model, **hints):
+        return getattr(state, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class PrimaryPinMiddleware:
+    """После успешной записи клиент REPLICA_PIN_SECONDS секунд читает
+    с основной базы, чтобы видеть свои изменения несмотря на отставание
+    реплик.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            use_primary()
+        if (settings.DATABASE_REPLICAS
+                and request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            get_cache().set(pin_key(request), True,
+                            settings.REPLICA_PIN_SECONDS)
+        return response
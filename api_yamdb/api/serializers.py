@@ -1,4 +1,4 @@
-from django.db.models import Avg
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework.serializers import UniqueTogetherValidator
 from reviews.models import Category, Comment, Genre, Review, Title
@@ -25,17 +25,13 @@ class TitleReadSerializer(serializers.ModelSerializer):
         read_only=True,
         many=True
     )
-    rating = serializers.SerializerMethodField(read_only=True)
+    rating = serializers.FloatField(read_only=True)
 
     class Meta:
         fields = ('id', 'category', 'genre', 'name',
                   'rating', 'year', 'description')
         model = Title
 
-    def get_rating(self, obj):
-        rating = Review.objects.filter(title=obj.id).aggregate(Avg('score'))
-        return rating['score__avg']
-
 
 class TitleWriteSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
@@ -49,7 +45,7 @@ class TitleWriteSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
         model = Title
 
 
@@ -61,14 +57,15 @@ class EmailSerializer(serializers.Serializer):
         if 'username' in data and data['username'] == 'me':
             raise serializers.ValidationError("can not use that name")
 
-        if 'email' in data and User.objects.filter(
-                email=data['email']
-        ).exists():
-            raise serializers.ValidationError("email is already in use")
-
-        if 'username' in data and User.objects.filter(
-                username=data['username']
-        ).exists():
+        # Существующая пара username и email получает новый код для входа.
+        taken = User.objects.filter(
+            Q(email=data['email']) | Q(username=data['username'])
+        ).values_list('username', 'email')
+        for username, email in taken:
+            if (username, email) == (data['username'], data['email']):
+                continue
+            if email == data['email']:
+                raise serializers.ValidationError("email is already in use")
             raise serializers.ValidationError("username is already in use")
 
         return super().validate(data)
@@ -87,7 +84,7 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        exclude = ('title',)
+        exclude = ('title', 'search_vector')
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -102,18 +99,39 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ('review',)
 
 
+class ReviewBatchSerializer(ReviewSerializer):
+    title = serializers.IntegerField(source='title_id')
+
+    class Meta(ReviewSerializer.Meta):
+        exclude = None
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
+class CommentBatchSerializer(CommentSerializer):
+    review = serializers.IntegerField(source='review_id')
+
+    class Meta(CommentSerializer.Meta):
+        exclude = None
+        fields = ('id', 'review', 'text', 'author', 'pub_date')
+        read_only_fields = ()
+
+
 class UserSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         if 'username' in data and data['username'] == 'me':
             raise serializers.ValidationError("can not use that name")
 
-        if 'email' in data and User.objects.filter(
+        others = User.objects.all()
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+
+        if 'email' in data and others.filter(
                 email=data['email']
         ).exists():
             raise serializers.ValidationError("email is already in use")
 
-        if 'username' in data and User.objects.filter(
+        if 'username' in data and others.filter(
                 username=data['username']
         ).exists():
             raise serializers.ValidationError("username is already in use")
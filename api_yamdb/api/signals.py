@@ -0,0 +1,43 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Comment, Genre, Review, Title
+
+from .cache import collection_key, invalidate_catalog, touch_collection
+
+CATALOG_MODELS = (Category, Genre, Title, Review)
+
+
+# Кеш сбрасывается после фиксации транзакции: иначе параллельный промах
+# успел бы закешировать под новой версией данные до коммита.
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_catalog_on_change(sender, using=None, **kwargs):
+    if sender in CATALOG_MODELS:
+        transaction.on_commit(invalidate_catalog, using=using)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_catalog_on_genre_change(sender, action, using=None, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(invalidate_catalog, using=using)
+
+
+# Правка текста или оценки не меняет ни число записей, ни pub_date,
+# поэтому валидаторы списков учитывают время последней правки коллекции.
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def touch_reviews(sender, instance, using=None, **kwargs):
+    transaction.on_commit(partial(
+        touch_collection, collection_key(Review, instance.title_id)
+    ), using=using)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_comments(sender, instance, using=None, **kwargs):
+    transaction.on_commit(partial(
+        touch_collection, collection_key(Comment, instance.review_id)
+    ), using=using)
@@ -0,0 +1,87 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# Запасное хранилище корзин на случай недоступности общего кеша.
+local_cache = LocMemCache('throttle', {})
+
+
+def call_cache(method, *args, **kwargs):
+    try:
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        return getattr(cache, method)(*args, **kwargs)
+    except Exception:
+        logger.warning('Общий кеш недоступен, ограничение частоты '
+                       'считается в памяти процесса', exc_info=True)
+        return getattr(local_cache, method)(*args, **kwargs)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов по алгоритму маркерной корзины.
+
+    Скорость 'N/период' из DEFAULT_THROTTLE_RATES даёт корзину на N запросов,
+    которая пополняется на N маркеров за период. Корзина хранится в общем
+    кеше под ключом пользователя или IP-адреса. Отказ приходит с заголовком
+    Retry-After, а проверка выполняется в APIView.initial до обработчика.
+    """
+    methods = None
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        if self.methods is not None and request.method not in self.methods:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        tokens, updated = call_cache(
+            'get', self.key, (self.num_requests, now))
+        self.tokens = min(self.num_requests,
+                          tokens + (now - updated) * self.refill_rate)
+        if self.tokens < 1:
+            return self.throttle_failure()
+        call_cache('set', self.key, (self.tokens - 1, now), self.duration)
+        return self.throttle_success()
+
+    @property
+    def refill_rate(self):
+        return self.num_requests / self.duration
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return (1 - self.tokens) / self.refill_rate
+
+
+class AuthThrottle(TokenBucketThrottle):
+    """Регистрация и получение токена: по IP-адресу клиента."""
+    scope = 'auth'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope,
+                                    'ident': self.get_ident(request)}
+
+
+class ReadThrottle(TokenBucketThrottle):
+    scope = 'read'
+    methods = SAFE_METHODS
+
+
+class WriteThrottle(TokenBucketThrottle):
+    scope = 'write'
+    methods = ('POST', 'PUT', 'PATCH', 'DELETE')
@@ -1,8 +1,9 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, SignUp, TitleViewSet, Token, UserViewSet)
+from .views import (CacheStats, CategoryViewSet, CommentBatch, CommentViewSet,
+                    GenreViewSet, ReviewBatch, ReviewViewSet, SignUp,
+                    TitleViewSet, Token, UserViewSet)
 
 router_v1 = routers.DefaultRouter()
 router_v1.register(r'categories', CategoryViewSet, basename='categories')
@@ -20,5 +21,8 @@ router_v1.register(r'users', UserViewSet, basename='users')
 urlpatterns = [
     path('v1/auth/signup/', SignUp.as_view()),
     path('v1/auth/token/', Token.as_view()),
+    path('v1/cache/stats/', CacheStats.as_view()),
+    path('v1/reviews/batch/', ReviewBatch.as_view()),
+    path('v1/comments/batch/', CommentBatch.as_view()),
     path('v1/', include(router_v1.urls)),
 ]
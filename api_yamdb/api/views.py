@@ -1,37 +1,60 @@
 import secrets
 import string
 
-from django.contrib.auth.hashers import check_password, make_password
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.decorators import action, permission_classes
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import (Category, Comment, Genre, LeaderboardEntry, Review,
+                            Title)
+from reviews.ratings import change_rating, score_stats
+from reviews.search import fill_search_vectors, search_titles
+from users.authentication import add_access_claims
+from users.confirmation import (check_confirmation_code,
+                                confirmation_code_fields,
+                                consume_confirmation_code)
 from users.models import User
+from users.outbox import enqueue_email
 
+from .cache import (CachedReadMixin, collection_key, get_stats,
+                    invalidate_catalog, touch_collection)
+from .export import RENDERERS, iter_titles
 from .filters import TitleFilter
-from .mixins import ModelMixinSet
+from .mixins import (ConditionalListMixin, ModelMixinSet, ReplicaReadMixin,
+                     SerializeTimingMixin)
+from .pagination import PubDatePagination, TitlePagination
 from .permissions import (Admin, AdminOrRedOnly, CommentPermission,
                           RewiewPermission)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          EmailSerializer, GenreSerializer, ReviewSerializer,
+from .serializers import (CategorySerializer, CommentBatchSerializer,
+                          CommentSerializer, EmailSerializer, GenreSerializer,
+                          ReviewBatchSerializer, ReviewSerializer,
                           TitleReadSerializer, TitleWriteSerializer,
                           TokenSerializer, UserSerializer)
+from .throttling import AuthThrottle, ReadThrottle, WriteThrottle
 
 CODE_LEN = 20
 
+MAX_BATCH_SIZE = 100
+
+LEADERBOARD_SIZE = 10
+MAX_LEADERBOARD_SIZE = 100
+
 DEFAULT_FROM_EMAIL = 'admin@admin.org'
 
 
-class CategoryViewSet(ModelMixinSet):
+class CategoryViewSet(ReplicaReadMixin, SerializeTimingMixin, CachedReadMixin,
+                      ModelMixinSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AdminOrRedOnly]
@@ -40,7 +63,8 @@ class CategoryViewSet(ModelMixinSet):
     lookup_field = 'slug'
 
 
-class GenreViewSet(ModelMixinSet):
+class GenreViewSet(ReplicaReadMixin, SerializeTimingMixin, CachedReadMixin,
+                   ModelMixinSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [AdminOrRedOnly]
@@ -49,70 +73,293 @@ class GenreViewSet(ModelMixinSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, SerializeTimingMixin, CachedReadMixin,
+                   ModelViewSet):
     queryset = Title.objects.all()
     permission_classes = [AdminOrRedOnly]
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    pagination_class = TitlePagination
+    cache_anonymous_only = True
+
+    def get_queryset(self):
+        """Для чтения категория и жанры подгружаются без запросов на строку."""
+        if self.action in ('list', 'retrieve'):
+            return self.queryset.select_related(
+                'category').prefetch_related('genre')
+        return self.queryset
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request,
+                                    *args, **kwargs)
 
-class ReviewViewSet(ModelViewSet):
+    @action(permission_classes=[Admin],
+            methods=('GET',),
+            url_path='export',
+            detail=False)
+    def export(self, request):
+        """Потоковая выгрузка всех произведений в NDJSON или CSV."""
+        output = request.query_params.get('output', 'ndjson')
+        if output not in RENDERERS:
+            raise ValidationError(
+                {'output': f'Допустимые значения: {", ".join(RENDERERS)}'})
+        render, content_type = RENDERERS[output]
+        response = StreamingHttpResponse(render(iter_titles()),
+                                         content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{output}"')
+        return response
+
+    @action(methods=('GET',),
+            url_path='search',
+            detail=False)
+    def search(self, request):
+        """Полнотекстовый поиск по названию, описанию и тексту отзывов."""
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({'q': 'Укажите поисковый запрос'})
+        queryset = search_titles(text).select_related(
+            'category').prefetch_related('genre')
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = TitleReadSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def leaderboard(self, request, kind):
+        """Первые позиции готовой таблицы рейтинга с фильтром по slug."""
+        try:
+            limit = int(request.query_params.get('limit', LEADERBOARD_SIZE))
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число'})
+        limit = max(1, min(limit, MAX_LEADERBOARD_SIZE))
+        entries = LeaderboardEntry.objects.filter(kind=kind)
+        category = request.query_params.get('category')
+        if category:
+            entries = entries.filter(title__category__slug=category)
+        genre = request.query_params.get('genre')
+        if genre:
+            entries = entries.filter(title__genre__slug=genre)
+        entries = entries.select_related(
+            'title__category').prefetch_related('title__genre')[:limit]
+        return Response([
+            dict(TitleReadSerializer(entry.title).data, score=entry.score)
+            for entry in entries
+        ])
+
+    @action(methods=('GET',), url_path='stats', detail=True)
+    def stats(self, request, *args, **kwargs):
+        return self.cached_response(self.build_stats, request,
+                                    *args, **kwargs)
+
+    def build_stats(self, request, *args, **kwargs):
+        """Распределение оценок произведения."""
+        return Response(score_stats(self.get_object().pk))
+
+    @action(methods=('GET',), url_path='top', detail=False)
+    def top(self, request):
+        return self.leaderboard(request, LeaderboardEntry.TOP)
+
+    @action(methods=('GET',), url_path='trending', detail=False)
+    def trending(self, request):
+        return self.leaderboard(request, LeaderboardEntry.TRENDING)
+
+
+class ReviewViewSet(ReplicaReadMixin, SerializeTimingMixin,
+                    ConditionalListMixin, ModelViewSet):
     serializer_class = ReviewSerializer
+    throttle_classes = [ReadThrottle, WriteThrottle]
     permission_classes = [RewiewPermission]
+    pagination_class = PubDatePagination
 
-    def get_title(self):
-        return get_object_or_404(
-            Title,
-            pk=self.kwargs.get('title_id'))
+    @cached_property
+    def title(self):
+        """Произведение из адреса, загружается один раз за запрос."""
+        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+
+    def get_collection_key(self):
+        return collection_key(Review, self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        """Определение queryset класса - отзывы запрашиваемого произведения."""
-        return self.get_title().reviews.all()
+        """Определение queryset класса - отзывы запрашиваемого произведения.
+
+        Правка и удаление блокируют строку отзыва: сдвиг рейтинга считается
+        от оценки, которую не изменит параллельный запрос.
+        """
+        reviews = self.title.reviews.select_related('author')
+        if self.action in ('update', 'partial_update', 'destroy'):
+            return reviews.select_for_update(of=('self',))
+        return reviews
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """Определение автора, произведения по user и title_id запроса."""
-        if Review.objects.filter(author=self.request.user,
-                                 title=self.get_title()).exists():
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
             raise ValidationError('Отзыв повторно невозможен')
-        serializer.save(author=self.request.user,
-                        title=self.get_title())
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        """Правка отзыва и сдвиг рейтинга произведения в одной транзакции."""
+        return super().update(request, *args, **kwargs)
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, SerializeTimingMixin,
+                     ConditionalListMixin, ModelViewSet):
     serializer_class = CommentSerializer
+    throttle_classes = [ReadThrottle, WriteThrottle]
     permission_classes = [CommentPermission]
+    pagination_class = PubDatePagination
 
-    def get_title(self):
-        return get_object_or_404(
-            Title,
-            pk=self.kwargs.get('title_id')
-        )
-
-    def get_review(self):
+    @cached_property
+    def review(self):
+        """Отзыв из адреса, проверенный на принадлежность произведению."""
         return get_object_or_404(
             Review,
-            pk=self.kwargs.get('review_id')
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id')
         )
 
+    def get_collection_key(self):
+        return collection_key(Comment, self.kwargs.get('review_id'))
+
     def get_queryset(self):
-        """Определение queryset класса - отзывы запрашиваемого произведения."""
-        """return self.get_review().comments.all()"""
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        """Определение queryset класса - комментарии запрашиваемого отзыва."""
+        return self.review.comments.select_related('author')
 
     def perform_create(self, serializer):
-        """Определение автора, произведения по user и title_id запроса."""
-        serializer.save(author=self.request.user,
-                        review=self.get_review())
+        """Определение автора, отзыва по user и review_id запроса."""
+        serializer.save(author=self.request.user, review=self.review)
+
+
+def touch_all(model, parent_ids):
+    for parent_id in parent_ids:
+        touch_collection(collection_key(model, parent_id))
+
+
+class BatchCreateView(APIView):
+    """Создание до MAX_BATCH_SIZE объектов одним запросом.
+
+    Каждый элемент проверяется сериализатором, связи проверяются одним
+    запросом на всю пачку, а объекты сохраняются через bulk_create.
+    В ответе для каждого элемента возвращается свой статус.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [WriteThrottle]
+    serializer_class = None
+    model = None
+
+    def check_batch(self, items):
+        """Возвращает ошибки для элементов пачки по их индексам."""
+        return {}
+
+    def after_create(self, objects):
+        pass
+
+    def post(self, request):
+        data = request.data
+        if not isinstance(data, list) or not 0 < len(data) <= MAX_BATCH_SIZE:
+            raise ValidationError(
+                f'Ожидается список из 1-{MAX_BATCH_SIZE} элементов')
+        results = [None] * len(data)
+        items = {}
+        for index, item in enumerate(data):
+            serializer = self.serializer_class(data=item)
+            if serializer.is_valid():
+                items[index] = serializer.validated_data
+            else:
+                results[index] = {'status': status.HTTP_400_BAD_REQUEST,
+                                  'errors': serializer.errors}
+        for index, errors in self.check_batch(items).items():
+            del items[index]
+            results[index] = {'status': status.HTTP_400_BAD_REQUEST,
+                              'errors': errors}
+        objects = {
+            index: self.model(author=request.user, **validated_data)
+            for index, validated_data in items.items()
+        }
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(objects.values())
+                self.after_create(objects.values())
+        except IntegrityError:
+            return Response(
+                {'detail': 'Конфликт с параллельной записью, повторите'},
+                status=status.HTTP_409_CONFLICT)
+        for index, obj in objects.items():
+            results[index] = {'status': status.HTTP_201_CREATED,
+                              'data': self.serializer_class(obj).data}
+        return Response(results, status=status.HTTP_200_OK)
+
+
+class ReviewBatch(BatchCreateView):
+    serializer_class = ReviewBatchSerializer
+    model = Review
+
+    def check_batch(self, items):
+        title_ids = {item['title_id'] for item in items.values()}
+        existing = set(Title.objects.filter(
+            pk__in=title_ids).values_list('pk', flat=True))
+        reviewed = set(Review.objects.filter(
+            author=self.request.user, title_id__in=existing
+        ).values_list('title_id', flat=True))
+        errors = {}
+        for index, item in items.items():
+            title_id = item['title_id']
+            if title_id not in existing:
+                errors[index] = {'title': ['Произведение не найдено']}
+            elif title_id in reviewed:
+                errors[index] = {'title': ['Отзыв повторно невозможен']}
+            reviewed.add(title_id)
+        return errors
+
+    def after_create(self, reviews):
+        """bulk_create не шлёт сигналы: рейтинг, поиск и кеш обновляем тут."""
+        changes = {}
+        for review in reviews:
+            score, count = changes.get(review.title_id, (0, 0))
+            changes[review.title_id] = (score + review.score, count + 1)
+        for title_id, (score, count) in changes.items():
+            change_rating(title_id, score, count)
+        if changes:
+            fill_search_vectors([review.pk for review in reviews])
+            transaction.on_commit(invalidate_catalog)
+            transaction.on_commit(lambda: touch_all(Review, changes))
+
+
+class CommentBatch(BatchCreateView):
+    serializer_class = CommentBatchSerializer
+    model = Comment
+
+    def check_batch(self, items):
+        review_ids = {item['review_id'] for item in items.values()}
+        existing = set(Review.objects.filter(
+            pk__in=review_ids).values_list('pk', flat=True))
+        return {
+            index: {'review': ['Отзыв не найден']}
+            for index, item in items.items()
+            if item['review_id'] not in existing
+        }
+
+    def after_create(self, comments):
+        review_ids = {comment.review_id for comment in comments}
+        transaction.on_commit(lambda: touch_all(Comment, review_ids))
 
 
 @permission_classes([AllowAny])
 class SignUp(APIView):
+    authentication_classes = []
+    throttle_classes = [AuthThrottle]
 
     def post(self, request):
         serializer = EmailSerializer(data=request.data)
@@ -126,17 +373,20 @@ class SignUp(APIView):
                 secrets.choice(string.ascii_letters + string.digits)
                 for _ in range(CODE_LEN)
             )
-            User.objects.get_or_create(
-                defaults={'username': username, 'email': email},
-                confirmation_code=make_password(confirmation_code))
-            send_mail('Токен подтверждения', confirmation_code,
-                      DEFAULT_FROM_EMAIL, [email])
+            with transaction.atomic():
+                User.objects.update_or_create(
+                    username=username, email=email,
+                    defaults=confirmation_code_fields(confirmation_code))
+                enqueue_email('Токен подтверждения', confirmation_code,
+                              DEFAULT_FROM_EMAIL, email)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 @permission_classes([AllowAny])
 class Token(APIView):
+    authentication_classes = []
+    throttle_classes = [AuthThrottle]
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
@@ -144,15 +394,15 @@ class Token(APIView):
             username = serializer.validated_data.get('username')
             conf_code = serializer.validated_data.get('confirmation_code')
             user = get_object_or_404(User, username=username)
-            if (User.objects.filter(username=username).exists()
-                    and check_password(conf_code, user.confirmation_code)):
+            if (check_confirmation_code(user, conf_code)
+                    and consume_confirmation_code(user)):
                 return Response(get_tokens_for_user(user),
                                 status=status.HTTP_200_OK)
             return Response(status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(SerializeTimingMixin, ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     lookup_field = 'username'
@@ -163,21 +413,28 @@ class UserViewSet(ModelViewSet):
             url_path='me',
             detail=False)
     def me(self, request, *args, **kwargs):
-        user = self.request.user
+        # Пользователь из токена собран без профиля: строка читается разом.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'PATCH':
-            new_data = request.data.dict()
+            serializer = UserSerializer(user, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
             if user.role == 'user':
-                new_data['role'] = 'user'
-            User.objects.filter(id=user.id).update(**new_data)
-            updated_user = get_object_or_404(User, id=user.id)
-            return Response(UserSerializer(updated_user).data,
-                            status=status.HTTP_200_OK)
+                serializer.validated_data['role'] = 'user'
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(UserSerializer(user).data)
 
 
+class CacheStats(APIView):
+    permission_classes = [Admin]
+
+    def get(self, request):
+        return Response(get_stats())
+
+
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = add_access_claims(RefreshToken.for_user(user), user)
 
     return {
         'access': str(refresh.access_token),
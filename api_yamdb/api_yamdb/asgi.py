@@ -0,0 +1,81 @@
+"""
+ASGI config for YaMDb project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+Django 2.2 has no native ASGI handler, so the WSGI application runs in a
+thread pool of ASGI_THREADS threads while the event loop keeps slow clients
+and idle keep-alive connections. Writes may occupy at most
+ASGI_WRITE_THREADS of those threads, so the read endpoints always have
+threads left when signups or batch writes are slow.
+
+Run it with:
+
+    gunicorn api_yamdb.asgi:application -k uvicorn.workers.UvicornWorker
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.wsgi import WsgiToAsgi
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ThreadPoolApplication:
+    """Запускает WSGI-приложение в пуле потоков и ограничивает запись."""
+
+    def __init__(self, wsgi_application, threads, write_threads):
+        self.wsgi = WsgiToAsgi(wsgi_application)
+        self.threads = threads
+        self.write_threads = min(write_threads, threads)
+        self.write_slots = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'websocket':
+            await self.reject_websocket(receive, send)
+        else:
+            raise ValueError(
+                f'Поддерживаются только HTTP-запросы, не {scope["type"]}')
+
+    async def http(self, scope, receive, send):
+        if scope['method'] in READ_METHODS:
+            await self.wsgi(scope, receive, send)
+        else:
+            if self.write_slots is None:
+                self.write_slots = asyncio.Semaphore(self.write_threads)
+            async with self.write_slots:
+                await self.wsgi(scope, receive, send)
+
+    async def reject_websocket(self, receive, send):
+        """WebSocket не поддерживается: соединение отклоняется (403)."""
+        message = await receive()
+        if message['type'] == 'websocket.connect':
+            await send({'type': 'websocket.close'})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                asyncio.get_event_loop().set_default_executor(
+                    ThreadPoolExecutor(max_workers=self.threads,
+                                       thread_name_prefix='yamdb'))
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = ThreadPoolApplication(
+    get_wsgi_application(),
+    threads=int(os.getenv('ASGI_THREADS', default=16)),
+    write_threads=int(os.getenv('ASGI_WRITE_THREADS', default=4)),
+)
@@ -0,0 +1,70 @@
+"""Настройки gunicorn из переменных окружения.
+
+gunicorn читает ./gunicorn.conf.py автоматически, поэтому в контейнере
+достаточно указать только приложение. Воркеры и потоки по умолчанию
+считаются от числа ядер.
+"""
+import multiprocessing
+import os
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default=default))
+
+
+def env_bool(name, default):
+    value = os.getenv(name, default=str(default))
+    return value.lower() in ('1', 'true', 'yes')
+
+
+cores = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = env_int('GUNICORN_WORKERS', cores * 2 + 1)
+threads = env_int('GUNICORN_THREADS', 4)
+worker_class = os.getenv(
+    'GUNICORN_WORKER_CLASS',
+    default='gthread' if threads > 1 else 'sync'
+)
+
+# Приложение импортируется один раз в мастере, воркеры получают его
+# копированием при записи и запускаются быстрее.
+preload_app = env_bool('GUNICORN_PRELOAD', True)
+
+# Плавная замена воркеров, чтобы утечки памяти не копились; разброс
+# не даёт всем воркерам перезапуститься одновременно.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Дольше keepalive_timeout nginx (60 с), иначе nginx может отправить
+# запрос в соединение, которое gunicorn уже закрывает.
+keepalive = env_int('GUNICORN_KEEPALIVE', 65)
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', default='-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', default='info')
+# pid воркера и время обработки в микросекундах.
+access_log_format = ('%(h)s "%(r)s" %(s)s %(b)s worker=%(p)s '
+                     'duration_us=%(D)s')
+
+
+def post_fork(server, worker):
+    server.log.info('Воркер %s запущен', worker.pid)
+
+
+def worker_exit(server, worker):
+    server.log.info('Воркер %s завершён после %s запросов', worker.pid,
+                    getattr(worker, 'nr', 0))
+
+
+def when_ready(server):
+    server.log.info(
+        'workers=%s threads=%s worker_class=%s preload=%s max_requests=%s',
+        workers, threads, worker_class, preload_app, max_requests)
+    if workers > 1 and 'locmem' in os.getenv('CACHE_BACKEND', 'locmem'):
+        server.log.warning(
+            'Кеш в памяти процесса при %s воркерах: сброс каталога, отзыв '
+            'токенов и ограничения частоты не видны другим воркерам. '
+            'Укажите CACHE_BACKEND=django_redis.cache.RedisCache.', workers)
@@ -7,6 +7,7 @@ class TitleAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'year', 'description')
     search_fields = ('name',)
     list_filter = ('year',)
+    readonly_fields = ('rating_sum', 'rating_count')
     empty_value_display = '-пусто-'
 
 
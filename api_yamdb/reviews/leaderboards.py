@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import LeaderboardEntry, Review, Title
+
+BATCH_SIZE = 1000
+
+
+def bayesian_score(rating_sum, rating_count, mean, min_votes):
+    """Средняя оценка, подтянутая к общему среднему при малом числе оценок."""
+    return (rating_sum + mean * min_votes) / (rating_count + min_votes)
+
+
+def iter_top(refreshed):
+    totals = Title.objects.aggregate(
+        rating_sum=Sum('rating_sum'), rating_count=Sum('rating_count'))
+    if not totals['rating_count']:
+        return
+    mean = totals['rating_sum'] / totals['rating_count']
+    titles = Title.objects.filter(rating_count__gt=0).values_list(
+        'id', 'rating_sum', 'rating_count')
+    for title_id, rating_sum, rating_count in titles.iterator():
+        yield LeaderboardEntry(
+            kind=LeaderboardEntry.TOP,
+            title_id=title_id,
+            score=bayesian_score(rating_sum, rating_count, mean,
+                                 settings.LEADERBOARD_MIN_VOTES),
+            refreshed=refreshed
+        )
+
+
+def iter_trending(refreshed):
+    counts = Review.objects.filter(
+        pub_date__gte=refreshed - settings.TRENDING_WINDOW
+    ).order_by().values('title_id').annotate(count=Count('id'))
+    for row in counts.iterator():
+        yield LeaderboardEntry(
+            kind=LeaderboardEntry.TRENDING,
+            title_id=row['title_id'],
+            score=row['count'],
+            refreshed=refreshed
+        )
+
+
+def refresh_leaderboards():
+    """Пересчитывает таблицу рейтингов целиком в одной транзакции.
+
+    Читатели до коммита видят прежний снимок, поэтому запросы
+    к рейтингам не агрегируют отзывы, а только читают готовые строки.
+    """
+    refreshed = timezone.now()
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        for entries in (iter_top(refreshed), iter_trending(refreshed)):
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= BATCH_SIZE:
+                    LeaderboardEntry.objects.bulk_create(batch)
+                    batch = []
+            LeaderboardEntry.objects.bulk_create(batch)
+    return refreshed
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from reviews.ratings import find_rating_drift
+
+
+class Command(BaseCommand):
+    help = 'Сверяет сохранённые рейтинги произведений с отзывами.'
+
+    def handle(self, *args, **options):
+        drifted = find_rating_drift()
+        for title in drifted:
+            self.stdout.write(
+                f'{title.pk} {title}: сохранено '
+                f'{title.rating_sum}/{title.rating_count}, '
+                f'по отзывам {title.actual_sum}/{title.actual_count}'
+            )
+        if drifted:
+            raise CommandError(
+                f'Расхождения в рейтингах: {len(drifted)}. '
+                'Запустите rebuild_ratings.'
+            )
+        self.stdout.write(self.style.SUCCESS('Расхождений нет'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги произведений по отзывам.'
+
+    def handle(self, *args, **options):
+        fixed = rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано рейтингов: {fixed}'
+        ))
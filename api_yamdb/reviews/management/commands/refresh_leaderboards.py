@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from reviews.leaderboards import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает таблицы лучших и популярных произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять каждые N секунд; 0 - пересчитать один раз.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            refreshed = refresh_leaderboards()
+            self.stdout.write(
+                f'Рейтинги пересчитаны: {refreshed:%Y-%m-%d %H:%M:%S}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+import reviews.validators
+
+TRIGRAM_INDEX = 'reviews_title_name_trgm'
+
+
+def create_trigram_index(apps, schema_editor):
+    """Триграммный индекс под icontains по названию, только для PostgreSQL.
+
+    Django строит icontains как UPPER(name) LIKE UPPER(...), поэтому
+    индекс построен по тому же выражению.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON reviews_title '
+        'USING gin (UPPER(name::text) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.PositiveSmallIntegerField(db_index=True, validators=(reviews.validators.validate_year,), verbose_name='Год выпуска'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
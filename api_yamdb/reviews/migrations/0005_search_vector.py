@@ -0,0 +1,60 @@
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+SEARCH_CONFIG = 'russian'
+
+INDEXES = (
+    ('reviews_title_search_vector', 'reviews_title'),
+    ('reviews_review_search_vector', 'reviews_review'),
+)
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Заполняет tsvector и строит GIN-индексы, только для PostgreSQL."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    Title.objects.update(search_vector=(
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Coalesce('description', Value('')), weight='B',
+                       config=SEARCH_CONFIG)
+    ))
+    Review.objects.update(
+        search_vector=SearchVector('text', config=SEARCH_CONFIG))
+    for name, table in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            'USING gin (search_vector)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_search_vectors, drop_search_indexes),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('top', 'Лучшие по рейтингу'), ('trending', 'Популярные за период')], max_length=16, verbose_name='Рейтинг')),
+                ('score', models.FloatField(verbose_name='Очки')),
+                ('refreshed', models.DateTimeField(verbose_name='Дата пересчёта')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Позиция в рейтинге',
+                'verbose_name_plural': 'Рейтинги произведений',
+                'ordering': ('kind', '-score', 'title_id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['kind', '-score'], name='reviews_leaderboard_score'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'title'), name='unique_leaderboard_title'),
+        ),
+    ]
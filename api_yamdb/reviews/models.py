@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from users.models import User
 
@@ -39,7 +40,8 @@ class Title(models.Model):
                             db_index=True)
     year = models.PositiveSmallIntegerField(
         'Год выпуска',
-        validators=(validate_year,)
+        validators=(validate_year,),
+        db_index=True
     )
     category = models.ForeignKey(
         Category,
@@ -60,6 +62,15 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Жанр'
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = 'Произведение'
@@ -69,6 +80,12 @@ class Title(models.Model):
     def __str__(self):
         return self.name[:NUMBER_LIST]
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class Review(models.Model):
     text = models.TextField(
@@ -93,6 +110,7 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -108,6 +126,13 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:NUMBER_LIST]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминаем исходную оценку, чтобы пересчитать рейтинг при правке."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(models.Model):
     text = models.TextField(
@@ -137,3 +162,39 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text[:NUMBER_LIST]
+
+
+class LeaderboardEntry(models.Model):
+    TOP = 'top'
+    TRENDING = 'trending'
+    KINDS = (
+        (TOP, 'Лучшие по рейтингу'),
+        (TRENDING, 'Популярные за период'),
+    )
+    kind = models.CharField('Рейтинг', max_length=16, choices=KINDS)
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение'
+    )
+    score = models.FloatField('Очки')
+    refreshed = models.DateTimeField('Дата пересчёта')
+
+    class Meta:
+        verbose_name = 'Позиция в рейтинге'
+        verbose_name_plural = 'Рейтинги произведений'
+        ordering = ('kind', '-score', 'title_id')
+        indexes = [
+            models.Index(fields=['kind', '-score'],
+                         name='reviews_leaderboard_score'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'title'],
+                name='unique_leaderboard_title'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.kind}: {self.title} ({self.score:.2f})'
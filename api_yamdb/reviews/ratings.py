@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Review, Title
+
+SCORES = range(1, 11)
+
+
+def change_rating(title_id, score_delta, count_delta):
+    """Атомарно сдвигает сохранённые сумму и количество оценок произведения."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta
+    )
+
+
+def actual_ratings():
+    """Произведения с суммой и количеством оценок, посчитанными по отзывам."""
+    return Title.objects.order_by('pk').annotate(
+        actual_sum=Coalesce(Sum('reviews__score'), 0),
+        actual_count=Count('reviews')
+    )
+
+
+def find_rating_drift():
+    """Произведения, чей сохранённый рейтинг расходится с отзывами."""
+    return [
+        title for title in actual_ratings()
+        if (title.rating_sum != title.actual_sum
+            or title.rating_count != title.actual_count)
+    ]
+
+
+def recount_rating(title_id):
+    """Пересчитывает рейтинг одного произведения с нуля."""
+    title = actual_ratings().get(pk=title_id)
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=title.actual_sum,
+        rating_count=title.actual_count
+    )
+
+
+@transaction.atomic
+def rebuild_ratings():
+    """Пересчитывает все рейтинги, возвращает число исправленных."""
+    drifted = find_rating_drift()
+    for title in drifted:
+        Title.objects.filter(pk=title.pk).update(
+            rating_sum=title.actual_sum,
+            rating_count=title.actual_count
+        )
+    return len(drifted)
+
+
+def median_from_histogram(histogram, count):
+    middle = ((count - 1) // 2, count // 2)
+    values = []
+    seen = 0
+    for score, amount in sorted(histogram.items()):
+        for position in middle:
+            if seen <= position < seen + amount:
+                values.append(score)
+        seen += amount
+    return sum(values) / len(values)
+
+
+def score_stats(title_id):
+    """Число, среднее, медиана и распределение оценок одним запросом."""
+    histogram = dict.fromkeys(SCORES, 0)
+    rows = Review.objects.filter(title_id=title_id).order_by().values(
+        'score').annotate(amount=Count('id')).values_list('score', 'amount')
+    histogram.update(rows)
+    count = sum(histogram.values())
+    if not count:
+        return {'count': 0, 'mean': None, 'median': None,
+                'histogram': histogram}
+    total = sum(score * amount for score, amount in histogram.items())
+    return {
+        'count': count,
+        'mean': total / count,
+        'median': median_from_histogram(histogram, count),
+        'histogram': histogram,
+    }
@@ -0,0 +1,139 @@
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.db import connection
+from django.db.models import (Case, F, FloatField, OuterRef, Q, Subquery,
+                              Value, When)
+from django.db.models.functions import Coalesce
+
+from .models import Review, Title
+
+SEARCH_CONFIG = 'russian'
+
+# Вклад совпадения в отзыве относительно совпадения в самом произведении.
+REVIEW_WEIGHT = 0.2
+
+TITLE_VECTOR = (
+    SearchVector('name', weight='A', config=SEARCH_CONFIG)
+    + SearchVector(Coalesce('description', Value('')), weight='B',
+                   config=SEARCH_CONFIG)
+)
+REVIEW_VECTOR = SearchVector('text', config=SEARCH_CONFIG)
+
+
+def uses_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def update_title_vector(title_id):
+    if uses_postgres():
+        Title.objects.filter(pk=title_id).update(search_vector=TITLE_VECTOR)
+
+
+def update_review_vector(review_id):
+    if uses_postgres():
+        Review.objects.filter(pk=review_id).update(
+            search_vector=REVIEW_VECTOR)
+
+
+def fill_search_vectors(review_ids=None):
+    """Заполняет векторы строк, созданных в обход save(), например bulk_create.
+
+    Без review_ids обновляет все произведения и отзывы с пустым вектором.
+    """
+    if uses_postgres():
+        reviews = Review.objects.filter(search_vector__isnull=True)
+        if review_ids is None:
+            Title.objects.filter(search_vector__isnull=True).update(
+                search_vector=TITLE_VECTOR)
+        else:
+            reviews = Review.objects.filter(pk__in=review_ids)
+        reviews.update(search_vector=REVIEW_VECTOR)
+    fallback_index.invalidate()
+
+
+class InvertedIndex:
+    """Инвертированный индекс в памяти процесса для баз без полнотекста.
+
+    Строится лениво при первом поиске и сбрасывается сигналами
+    при изменении произведений и отзывов.
+    """
+    weights = {'name': 1.0, 'description': 0.4, 'review': REVIEW_WEIGHT}
+
+    def __init__(self):
+        self.postings = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def tokenize(text):
+        return re.findall(r'\w+', (text or '').lower())
+
+    def invalidate(self):
+        self.postings = None
+
+    def add(self, postings, title_id, text, weight):
+        for token in self.tokenize(text):
+            postings[token][title_id] += weight
+
+    def build(self):
+        postings = defaultdict(lambda: defaultdict(float))
+        titles = Title.objects.values_list('id', 'name', 'description')
+        for title_id, name, description in titles.iterator():
+            self.add(postings, title_id, name, self.weights['name'])
+            self.add(postings, title_id, description,
+                     self.weights['description'])
+        reviews = Review.objects.values_list('title_id', 'text')
+        for title_id, text in reviews.iterator():
+            self.add(postings, title_id, text, self.weights['review'])
+        return postings
+
+    def search(self, text):
+        """Id произведений, где есть все слова запроса, по убыванию веса."""
+        with self.lock:
+            if self.postings is None:
+                self.postings = self.build()
+            postings = self.postings
+        scores = None
+        for token in set(self.tokenize(text)):
+            matches = postings.get(token, {})
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {title_id: score + matches[title_id]
+                          for title_id, score in scores.items()
+                          if title_id in matches}
+        return sorted(scores or {}, key=lambda title_id: -scores[title_id])
+
+
+fallback_index = InvertedIndex()
+
+
+def search_titles(text):
+    """Произведения по запросу с аннотацией rank, лучшие первыми."""
+    if uses_postgres():
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+        matching_reviews = Review.objects.filter(search_vector=query)
+        review_rank = matching_reviews.filter(
+            title=OuterRef('pk')
+        ).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by('-rank').values('rank')[:1]
+        return Title.objects.filter(
+            Q(search_vector=query)
+            | Q(pk__in=matching_reviews.values('title_id'))
+        ).annotate(
+            rank=Coalesce(SearchRank(F('search_vector'), query), 0.0)
+            + REVIEW_WEIGHT * Coalesce(
+                Subquery(review_rank, output_field=FloatField()), 0.0)
+        ).order_by('-rank', 'pk')
+    ids = fallback_index.search(text)
+    return Title.objects.filter(pk__in=ids).annotate(
+        rank=Case(
+            *[When(pk=title_id, then=Value(float(len(ids) - position)))
+              for position, title_id in enumerate(ids)],
+            output_field=FloatField()
+        )
+    ).order_by('-rank', 'pk')
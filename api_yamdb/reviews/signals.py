@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review, Title
+from .ratings import change_rating, recount_rating
+from .search import fallback_index, update_review_vector, update_title_vector
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        change_rating(instance.title_id, instance.score, 1)
+    else:
+        loaded_score = getattr(instance, '_loaded_score', None)
+        if loaded_score is None:
+            recount_rating(instance.title_id)
+        elif loaded_score != instance.score:
+            change_rating(instance.title_id,
+                          instance.score - loaded_score, 0)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    change_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Title)
+def update_title_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_title_vector(instance.pk)
+    fallback_index.invalidate()
+
+
+@receiver(post_save, sender=Review)
+def update_review_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_review_vector(instance.pk)
+    fallback_index.invalidate()
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+def invalidate_search_on_delete(sender, **kwargs):
+    fallback_index.invalidate()
@@ -1,5 +1,14 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutboxEmail, User
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'created', 'attempts', 'sent_at')
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
+
 
 admin.site.register(User)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# Секреты не попадают в кеш: при обращении к ним поле догружается из базы.
+SECRET_FIELDS = ('password', 'confirmation_code', 'confirmation_code_expires')
+
+CACHED_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname not in SECRET_FIELDS
+)
+
+ACCESS_CLAIMS = ('role', 'is_superuser', 'token_version')
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def token_version_key(user_id):
+    return f'auth:token-version:{user_id}'
+
+
+def forget_user(user_id):
+    """Сбрасывает закешированного пользователя после изменения его данных."""
+    cache.delete_many([user_cache_key(user_id), token_version_key(user_id)])
+
+
+def add_access_claims(token, user):
+    """Кладёт в токен роль и версию, по которым права проверяются без базы."""
+    for claim in ACCESS_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def build_user(values):
+    """Пользователь из части полей, остальные догружаются при обращении."""
+    names = [field.attname for field in User._meta.concrete_fields
+             if field.attname in values]
+    return User.from_db(DEFAULT_DB_ALIAS, names,
+                        [values[name] for name in names])
+
+
+def get_token_state(user_id):
+    """Текущие версия токенов и активность пользователя, из кеша или базы."""
+    key = token_version_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values_list(
+            'token_version', 'is_active').first()
+        if state is None:
+            raise AuthenticationFailed(_('User not found'),
+                                       code='user_not_found')
+        cache.set(key, state, settings.AUTH_USER_CACHE_TIMEOUT)
+    return state
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация, которая не читает пользователя из базы на каждый
+    запрос.
+
+    Поля пользователя без секретов хранятся в кеше AUTH_USER_CACHE_TIMEOUT
+    секунд и сбрасываются сигналами и forget_user при изменении роли.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        values = cache.get(user_cache_key(user_id))
+        if values is None:
+            user = super().get_user(validated_token)
+            cache.set(
+                user_cache_key(user.pk),
+                {name: getattr(user, name) for name in CACHED_FIELDS},
+                settings.AUTH_USER_CACHE_TIMEOUT
+            )
+            return user
+        user = build_user(values)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+        return user
+
+
+class ClaimsJWTAuthentication(CachedJWTAuthentication):
+    """Пользователь собирается из утверждений токена без чтения его строки.
+
+    Права проверяются по role и is_superuser из токена, остальные поля
+    догружаются из базы только при обращении. Смена прав увеличивает
+    token_version пользователя, и выданные раньше токены отклоняются.
+    Токены без этих утверждений обрабатываются как в CachedJWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in ACCESS_CLAIMS):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        token_version, is_active = get_token_state(user_id)
+        if not is_active:
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+        if token_version != validated_token['token_version']:
+            raise AuthenticationFailed(_('Token has been revoked'),
+                                       code='token_revoked')
+        values = {claim: validated_token[claim] for claim in ACCESS_CLAIMS}
+        return build_user(dict(values, id=user_id, is_active=True))
@@ -0,0 +1,48 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.utils import timezone
+
+from .models import User
+
+
+def hash_confirmation_code(code):
+    """HMAC-SHA256 кода на SECRET_KEY.
+
+    Код случайный и живёт недолго, медленный парольный хешер ему не нужен.
+    """
+    return hmac.new(
+        settings.SECRET_KEY.encode(), code.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def confirmation_code_fields(code):
+    return {
+        'confirmation_code': hash_confirmation_code(code),
+        'confirmation_code_expires': (
+            timezone.now() + settings.CONFIRMATION_CODE_LIFETIME
+        ),
+    }
+
+
+def check_confirmation_code(user, code):
+    stored = user.confirmation_code
+    if not stored:
+        return False
+    if user.confirmation_code_expires is None:
+        # Коды, выданные до перехода на HMAC, хранятся парольным хешем.
+        return check_password(code, stored)
+    if user.confirmation_code_expires < timezone.now():
+        return False
+    return hmac.compare_digest(stored, hash_confirmation_code(code))
+
+
+def consume_confirmation_code(user):
+    """Гасит код; False, если его уже использовал параллельный запрос."""
+    return bool(User.objects.filter(
+        pk=user.pk, confirmation_code=user.confirmation_code
+    ).exclude(confirmation_code='').update(
+        confirmation_code='', confirmation_code_expires=None
+    ))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from users.outbox import BATCH_SIZE, purge_outbox, send_pending
+
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--interval', type=float, default=2,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь один раз и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        purged_at = None
+        while True:
+            sent = send_pending(options['batch_size'])
+            if sent:
+                self.stdout.write(f'Отправлено писем: {sent}')
+                continue
+            if (purged_at is None
+                    or time.monotonic() - purged_at > PURGE_INTERVAL):
+                purged = purge_outbox()
+                purged_at = time.monotonic()
+                if purged:
+                    self.stdout.write(f'Удалено старых писем: {purged}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
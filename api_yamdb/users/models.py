@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -14,11 +15,53 @@ class User(AbstractUser):
         blank=True,
     )
     confirmation_code = models.CharField(max_length=256)
+    confirmation_code_expires = models.DateTimeField(null=True, blank=True)
     username = models.CharField(max_length=150, unique=True)
     email = models.EmailField(unique=True)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Поля, которые попадают в токен; их смена отзывает выданные токены.
+    ACCESS_FIELDS = ('role', 'is_superuser', 'is_active')
 
     models.UniqueConstraint(fields=['username', 'email'],
                             name='unic_username_email_record')
 
     class Meta:
         ordering = ('username',)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминаем исходные права, чтобы отозвать токены при их смене."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_access = instance.get_access()
+        return instance
+
+    def get_access(self):
+        loaded = self.__dict__
+        if any(field not in loaded for field in self.ACCESS_FIELDS):
+            return None
+        return tuple(loaded[field] for field in self.ACCESS_FIELDS)
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.EmailField('Отправитель')
+    recipient = models.EmailField('Получатель')
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+    send_after = models.DateTimeField(
+        'Отправить не раньше',
+        default=timezone.now,
+        db_index=True
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('send_after',)
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=1)
+
+
+def enqueue_email(subject, body, from_email, recipient):
+    """Ставит письмо в очередь, отправит его команда send_emails.
+
+    Текст письма может содержать код подтверждения, поэтому он хранится
+    только до отправки или последней неудачной попытки.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject, body=body, from_email=from_email,
+        recipient=recipient
+    )
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.send_after = (timezone.now()
+                        + RETRY_DELAY * 2 ** (email.attempts - 1))
+    if email.attempts >= MAX_ATTEMPTS:
+        email.body = ''
+    email.save(update_fields=('attempts', 'last_error', 'send_after',
+                              'body'))
+
+
+def send_pending(batch_size=BATCH_SIZE):
+    """Отправляет пачку писем через одно соединение.
+
+    Возвращает число отправленных писем. Строки пачки блокируются
+    с SKIP LOCKED, поэтому несколько воркеров не отправят одно письмо
+    дважды. Неудачные письма откладываются с экспоненциальной задержкой
+    до MAX_ATTEMPTS попыток.
+    """
+    with transaction.atomic():
+        batch = list(OutboxEmail.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            sent_at__isnull=True,
+            attempts__lt=MAX_ATTEMPTS,
+            send_after__lte=timezone.now()
+        )[:batch_size])
+        if not batch:
+            return 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in batch:
+                mark_failed(email, error)
+            return 0
+        sent = []
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    email.subject, email.body, email.from_email,
+                    [email.recipient], connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    mark_failed(email, error)
+                else:
+                    sent.append(email.pk)
+        finally:
+            connection.close()
+        OutboxEmail.objects.filter(pk__in=sent).update(
+            sent_at=timezone.now(), attempts=F('attempts') + 1, body=''
+        )
+    return len(sent)
+
+
+def purge_outbox():
+    """Удаляет строки очереди старше OUTBOX_RETENTION, возвращает их число.
+
+    К этому времени письмо отправлено или попытки исчерпаны.
+    """
+    deleted, _ = OutboxEmail.objects.filter(
+        created__lt=timezone.now() - settings.OUTBOX_RETENTION
+    ).delete()
+    return deleted
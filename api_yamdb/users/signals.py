@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import forget_user
+from .models import User
+
+
+@receiver(pre_save, sender=User)
+def revoke_tokens_on_access_change(sender, instance, raw=False, **kwargs):
+    loaded_access = getattr(instance, '_loaded_access', None)
+    if raw or loaded_access is None:
+        return
+    if loaded_access != instance.get_access():
+        instance.token_version += 1
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache_on_save(sender, instance, **kwargs):
+    instance._loaded_access = instance.get_access()
+    forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_cache_on_delete(sender, instance, **kwargs):
+    forget_user(instance.pk)
@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+
+    return Category.objects.create(name='Фильм', slug='films')
+
+
+@pytest.fixture
+def genres():
+    from reviews.models import Genre
+
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+
+
+@pytest.fixture
+def title(category, genres):
+    from reviews.models import Title
+
+    title = Title.objects.create(
+        name='Побег из Шоушенка', year=1994, category=category,
+        description='Фильм'
+    )
+    title.genre.set(genres)
+    return title
+
+
+@pytest.fixture
+def review(title, user):
+    from reviews.models import Review
+
+    return Review.objects.create(
+        title=title, author=user, text='Отлично', score=10
+    )
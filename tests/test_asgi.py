@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+
+def run(app, scope, messages):
+    sent = []
+    messages = iter(messages)
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        sent.append(message)
+
+    async def main():
+        await app(scope, receive, send)
+
+    asyncio.run(main())
+    return sent
+
+
+def http_scope(method, path):
+    return {
+        'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+        'http_version': '1.1', 'headers': [], 'server': ('testserver', 80),
+    }
+
+
+class TestAsgiApplication:
+
+    def test_lifespan(self):
+        from api_yamdb.asgi import application
+
+        sent = run(application, {'type': 'lifespan'}, [
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}
+        ])
+        assert [message['type'] for message in sent] == [
+            'lifespan.startup.complete', 'lifespan.shutdown.complete'
+        ]
+
+    def test_websocket_is_rejected(self):
+        from api_yamdb.asgi import application
+
+        sent = run(application, {'type': 'websocket', 'path': '/'},
+                   [{'type': 'websocket.connect'}])
+        assert sent == [{'type': 'websocket.close'}], (
+            'Проверьте, что WebSocket-соединение отклоняется без ошибки'
+        )
+
+    def test_unknown_scope_type(self):
+        from api_yamdb.asgi import application
+
+        with pytest.raises(ValueError):
+            run(application, {'type': 'unknown'}, [])
+
+    @pytest.mark.django_db
+    def test_http_through_wsgi(self):
+        from api_yamdb.asgi import application
+
+        sent = run(application, http_scope('GET', '/api/v1/unknown/'),
+                   [{'type': 'http.request', 'body': b''}])
+        assert sent[0]['status'] == 404, (
+            'Проверьте, что ASGI-приложение обслуживает запросы Django'
+        )
+
+    def test_writes_are_limited(self):
+        from api_yamdb.asgi import ThreadPoolApplication
+
+        active = []
+        peak = []
+
+        def wsgi(environ, start_response):
+            active.append(1)
+            peak.append(len(active))
+            start_response('200 OK', [])
+            active.pop()
+            return [b'']
+
+        app = ThreadPoolApplication(wsgi, threads=4, write_threads=1)
+
+        async def main():
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                await asyncio.sleep(0.01)
+
+            await asyncio.gather(*[
+                app(http_scope('POST', '/'), receive, send)
+                for _ in range(5)
+            ])
+
+        asyncio.run(main())
+        assert max(peak) == 1
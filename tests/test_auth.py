@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+class TestConfirmationCode:
+
+    def sign_up(self, client, username='newcomer'):
+        client.post('/api/v1/auth/signup/', {
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+        call_command('send_emails', '--once')
+        return mail.outbox[-1].body
+
+    def get_token(self, client, code, username='newcomer'):
+        return client.post('/api/v1/auth/token/', {
+            'username': username, 'confirmation_code': code
+        })
+
+    def test_code_is_single_use(self, anon_client):
+        code = self.sign_up(anon_client)
+        response = self.get_token(anon_client, code)
+        assert response.status_code == 200
+        assert 'access' in response.data
+        response = self.get_token(anon_client, code)
+        assert response.status_code == 400, (
+            'Проверьте, что код подтверждения нельзя использовать дважды'
+        )
+
+    def test_wrong_code(self, anon_client):
+        self.sign_up(anon_client)
+        assert self.get_token(anon_client, 'wrong').status_code == 400
+
+    def test_expired_code(self, anon_client, django_user_model):
+        code = self.sign_up(anon_client)
+        django_user_model.objects.update(
+            confirmation_code_expires=timezone.now() - timedelta(seconds=1)
+        )
+        assert self.get_token(anon_client, code).status_code == 400, (
+            'Проверьте, что просроченный код не принимается'
+        )
+
+    def test_code_is_not_stored_in_plain_text(self, anon_client,
+                                              django_user_model):
+        code = self.sign_up(anon_client)
+        user = django_user_model.objects.get(username='newcomer')
+        assert code not in user.confirmation_code
+
+    def test_existing_user_can_log_in_again(self, anon_client):
+        code = self.sign_up(anon_client)
+        assert self.get_token(anon_client, code).status_code == 200
+        new_code = self.sign_up(anon_client)
+        assert new_code != code
+        response = self.get_token(anon_client, new_code)
+        assert response.status_code == 200, (
+            'Проверьте, что зарегистрированный пользователь может '
+            'получить новый код и войти повторно'
+        )
+        assert 'access' in response.data
+
+    @pytest.mark.parametrize('username, email', [
+        ('newcomer', 'other@yamdb.fake'),
+        ('other', 'newcomer@yamdb.fake'),
+    ])
+    def test_signup_rejects_someone_elses_pair(self, anon_client,
+                                               username, email):
+        self.sign_up(anon_client)
+        response = anon_client.post('/api/v1/auth/signup/', {
+            'username': username, 'email': email
+        })
+        assert response.status_code == 400
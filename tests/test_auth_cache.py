@@ -0,0 +1,140 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_queries(context):
+    return [query for query in context.captured_queries
+            if 'FROM "users_user"' in query['sql']]
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+
+    def test_user_is_cached(self, user_client):
+        user_client.get('/api/v1/users/me/')
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+        assert response.data['username'] == 'TestUser'
+        assert len(user_queries(context)) == 1, (
+            'Проверьте, что пользователь из токена берётся из кеша, '
+            'а профиль для /me читается одним запросом'
+        )
+
+    def test_role_change_by_admin(self, admin_client, user, user_client):
+        assert user_client.get('/api/v1/users/').status_code == 403
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', {'role': 'admin'})
+        assert response.status_code == 200
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что смена роли сбрасывает кеш пользователя'
+        )
+
+    def test_role_change_by_me(self, moderator_client, moderator):
+        moderator_client.get('/api/v1/users/me/')
+        moderator_client.patch('/api/v1/users/me/', {'role': 'admin'})
+        response = moderator_client.get('/api/v1/users/me/')
+        assert response.data['role'] == 'admin'
+
+    def test_inactive_user(self, user_client, user):
+        user_client.get('/api/v1/users/me/')
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+
+
+def claims_client(user):
+    from api.views import get_tokens_for_user
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    token = get_tokens_for_user(user)['access']
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db
+class TestAccessClaims:
+
+    def test_role_from_token(self, admin):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        client = claims_client(admin)
+        token = AccessToken(client._credentials['HTTP_AUTHORIZATION'][7:])
+        assert token['role'] == 'admin'
+        assert token['is_superuser'] is False
+        client.get('/api/v1/categories/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/categories/',
+                                   {'name': 'Кино', 'slug': 'films'})
+        assert response.status_code == 201
+        assert not user_queries(context), (
+            'Проверьте, что права проверяются по утверждениям токена'
+        )
+
+    def test_author_without_user_query(self, user, title):
+        from reviews.models import Review
+
+        review = Review.objects.create(title=title, author=user, text='Да',
+                                       score=5)
+        client = claims_client(user)
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.delete(url)
+        assert response.status_code == 204
+        assert not user_queries(context)
+
+    def test_role_change_revokes_token(self, admin, user):
+        client = claims_client(admin)
+        assert client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        admin.save()
+        assert client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что смена роли отзывает выданные токены'
+        )
+        other_changes = claims_client(user)
+        user.bio = 'Критик'
+        user.save()
+        assert other_changes.get('/api/v1/users/me/').status_code == 200
+
+    def test_role_change_by_me_revokes_token(self, moderator):
+        client = claims_client(moderator)
+        client.patch('/api/v1/users/me/', {'role': 'admin'})
+        assert client.get('/api/v1/users/me/').status_code == 401
+        response = claims_client(
+            type(moderator).objects.get(pk=moderator.pk)
+        ).get('/api/v1/users/me/')
+        assert response.data['role'] == 'admin'
+
+    def test_me_reads_profile_once(self, moderator):
+        client = claims_client(moderator)
+        client.get('/api/v1/users/me/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/users/me/')
+        assert response.data['email'] == moderator.email
+        assert len(user_queries(context)) == 1, (
+            'Проверьте, что /me не догружает поля профиля по одному'
+        )
+
+    def test_me_cannot_restore_revoked_token(self, admin, moderator):
+        old_client = claims_client(moderator)
+        response = claims_client(admin).patch(
+            f'/api/v1/users/{moderator.username}/', {'role': 'user'})
+        assert response.status_code == 200
+        assert old_client.get('/api/v1/users/me/').status_code == 401
+
+        demoted = type(moderator).objects.get(pk=moderator.pk)
+        response = claims_client(demoted).patch(
+            '/api/v1/users/me/',
+            {'token_version': 0, 'is_superuser': True, 'bio': 'Критик'}
+        )
+        assert response.status_code == 200
+        demoted.refresh_from_db()
+        assert demoted.bio == 'Критик'
+        assert demoted.token_version > 0 and not demoted.is_superuser, (
+            'Проверьте, что через /me нельзя менять token_version '
+            'и is_superuser'
+        )
+        assert old_client.get('/api/v1/users/me/').status_code == 401
@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestBatchWrites:
+
+    def test_review_batch(self, user_client, user, title, category):
+        from reviews.models import Review, Title
+
+        other = Title.objects.create(name='Другое', year=2001,
+                                     category=category)
+        reviewed = Title.objects.create(name='Уже с отзывом', year=2002)
+        Review.objects.create(title=reviewed, author=user, text='Было',
+                              score=1)
+        payload = [
+            {'title': title.id, 'text': 'Отлично', 'score': 9},
+            {'title': other.id, 'text': 'Хорошо', 'score': 7},
+            {'title': other.id, 'text': 'Дубль', 'score': 1},
+            {'title': reviewed.id, 'text': 'Повтор', 'score': 2},
+            {'title': 100500, 'text': 'Нет такого', 'score': 5},
+            {'title': title.id, 'score': 5},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post('/api/v1/reviews/batch/', payload,
+                                        format='json')
+        assert response.status_code == 200
+        statuses = [item['status'] for item in response.data]
+        assert statuses == [201, 201, 400, 400, 400, 400]
+        assert response.data[0]['data']['author'] == user.username
+        assert len(context) < 10, (
+            'Проверьте, что пачка отзывов сохраняется фиксированным '
+            'числом запросов'
+        )
+        title.refresh_from_db()
+        other.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (9, 1)
+        assert (other.rating_sum, other.rating_count) == (7, 1)
+
+    def test_comment_batch(self, user_client, review):
+        from reviews.models import Comment
+
+        response = user_client.post('/api/v1/comments/batch/', [
+            {'review': review.id, 'text': 'Первый'},
+            {'review': review.id, 'text': 'Второй'},
+            {'review': 100500, 'text': 'Мимо'},
+        ], format='json')
+        assert [item['status'] for item in response.data] == [201, 201, 400]
+        assert Comment.objects.filter(review=review).count() == 2
+
+    def test_batch_limits(self, user_client, anon_client):
+        from api.views import MAX_BATCH_SIZE
+
+        url = '/api/v1/comments/batch/'
+        assert anon_client.post(url, [], format='json').status_code == 401
+        assert user_client.post(url, [], format='json').status_code == 400
+        too_many = [{'review': 1, 'text': 'x'}] * (MAX_BATCH_SIZE + 1)
+        response = user_client.post(url, too_many, format='json')
+        assert response.status_code == 400
@@ -0,0 +1,87 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+SIZES = ('--users', '6', '--categories', '2', '--genres', '3',
+         '--titles', '8', '--reviews', '40', '--comments', '10')
+
+
+def generate(seed=7):
+    call_command('generate_data', '--seed', str(seed), *SIZES,
+                 stdout=StringIO())
+
+
+def snapshot():
+    from reviews.models import Review, Title
+
+    return (
+        list(Title.objects.order_by('pk').values_list(
+            'name', 'year', 'rating_sum', 'rating_count')),
+        list(Review.objects.order_by('pk').values_list('text', 'score')),
+    )
+
+
+@pytest.mark.django_db
+class TestBenchmarkSuite:
+
+    def test_generated_data(self):
+        from reviews.models import Comment, Genre, Review, Title
+        from users.models import User
+
+        generate()
+        assert Title.objects.count() == 8
+        assert Genre.objects.count() == 3
+        assert Review.objects.count() == 40
+        assert Comment.objects.count() == 10
+        assert User.objects.filter(role='admin').count() == 1
+        assert sum(Title.objects.values_list('rating_count', flat=True)) \
+            == 40, 'Проверьте, что рейтинги пересчитаны после генерации'
+        with pytest.raises(CommandError):
+            generate()
+
+    def test_same_seed_same_data(self):
+        from reviews.models import Category, Genre, Title
+        from users.models import User
+
+        generate()
+        first = snapshot()
+        Title.objects.all().delete()
+        Genre.objects.all().delete()
+        Category.objects.all().delete()
+        User.objects.all().delete()
+        generate()
+        assert snapshot() == first, (
+            'Проверьте, что одинаковый seed даёт одинаковые данные'
+        )
+
+    def test_report(self, tmp_path):
+        from reviews.models import Comment
+
+        generate()
+        comments = Comment.objects.count()
+        first = tmp_path / 'first.json'
+        call_command('benchmark_api', '--iterations', '2',
+                     '--output', str(first), stdout=StringIO())
+        report = json.loads(first.read_text(encoding='utf-8'))
+        assert set(report['scenarios']) >= {
+            'title_list', 'title_filter', 'reviews_page', 'comment_create',
+            'signup', 'token'
+        }
+        for result in report['scenarios'].values():
+            assert result['p50_ms'] <= result['p99_ms']
+            assert result['queries'] >= 0
+            assert max(result['statuses']) < 400, result
+        assert Comment.objects.count() == comments, (
+            'Проверьте, что сценарии записи откатываются'
+        )
+        out = StringIO()
+        call_command('benchmark_api', '--iterations', '2', '--output',
+                     str(tmp_path / 'second.json'), '--compare', str(first),
+                     stdout=out)
+        assert 'title_list: p50' in out.getvalue()
+
+    def test_requires_data(self):
+        with pytest.raises(CommandError):
+            call_command('benchmark_api', '--iterations', '1')
@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestCatalogCache:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        return response, len(context)
+
+    def test_repeated_read_is_served_from_cache(self, anon_client, genres):
+        url = '/api/v1/genres/'
+        first, first_queries = self.get(anon_client, url)
+        second, second_queries = self.get(anon_client, url)
+        assert first_queries > 0
+        assert second_queries == 0, (
+            'Проверьте, что повторный запрос жанров отдаётся из кеша'
+        )
+        assert first.data == second.data
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalidation_waits_for_commit(self, category):
+        from api.cache import get_version
+        from django.db import transaction
+        from reviews.models import Title
+
+        before = get_version()
+        with transaction.atomic():
+            Title.objects.create(name='Новинка', year=2020,
+                                 category=category)
+            assert get_version() == before, (
+                'Проверьте, что кеш каталога сбрасывается после коммита, '
+                'а не до него'
+            )
+        assert get_version() != before
+
+    # Кеш сбрасывается в on_commit, а он срабатывает только вне
+    # транзакции теста.
+    @pytest.mark.django_db(transaction=True)
+    def test_catalog_change_invalidates_cache(self, anon_client, title,
+                                              user):
+        from reviews.models import Genre, Review
+
+        self.get(anon_client, '/api/v1/genres/')
+        Genre.objects.create(name='Ужасы', slug='horror')
+        response, _ = self.get(anon_client, '/api/v1/genres/')
+        assert response.data['count'] == 3, (
+            'Проверьте, что изменение жанров сбрасывает кеш'
+        )
+
+        url = f'/api/v1/titles/{title.id}/'
+        response, _ = self.get(anon_client, url)
+        assert response.data['rating'] is None
+        Review.objects.create(title=title, author=user, text='Да', score=7)
+        response, _ = self.get(anon_client, url)
+        assert response.data['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведений'
+        )
+
+    def test_titles_cached_for_anonymous_only(self, admin_client, title):
+        admin_client.get('/api/v1/users/me/')
+        _, first_queries = self.get(admin_client, '/api/v1/titles/')
+        _, second_queries = self.get(admin_client, '/api/v1/titles/')
+        assert second_queries == first_queries
+
+    def test_stats(self, anon_client, admin_client, genres):
+        self.get(anon_client, '/api/v1/genres/')
+        self.get(anon_client, '/api/v1/genres/')
+        response = admin_client.get('/api/v1/cache/stats/')
+        assert response.data == {'hits': 1, 'misses': 1}
+        assert anon_client.get('/api/v1/cache/stats/').status_code == 401
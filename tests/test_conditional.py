@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_reviews_not_modified(self, anon_client, review, another_user):
+        from reviews.models import Review
+
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = anon_client.get(url)
+        etag = response['ETag']
+        assert etag.startswith('"'), 'Проверьте, что ETag отзывов строгий'
+        assert response.has_header('Last-Modified')
+
+        with CaptureQueriesContext(connection) as context:
+            response = anon_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert not any('"reviews_review"."text"' in query['sql']
+                       for query in context.captured_queries), (
+            'Проверьте, что для ответа 304 отзывы не выбираются'
+        )
+
+        Review.objects.create(title=review.title, author=another_user,
+                              text='Новый', score=3)
+        response = anon_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    # Время правки обновляется в on_commit.
+    @pytest.mark.django_db(transaction=True)
+    def test_review_edit_changes_validators(self, anon_client, user_client,
+                                            review, monkeypatch):
+        import time
+        from types import SimpleNamespace
+
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = anon_client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        assert anon_client.get(
+            url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        # Last-Modified точен до секунды: правка происходит секундой позже.
+        later = time.time() + 1
+        monkeypatch.setattr('api.cache.time', SimpleNamespace(
+            time=lambda: later))
+        response = user_client.patch(f'{url}{review.id}/',
+                                     data={'text': 'Уже не так', 'score': 4})
+        assert response.status_code == 200
+        response = anon_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что правка текста и оценки меняет ETag отзывов'
+        )
+        assert response['ETag'] != etag
+        assert response.data['results'][0]['text'] == 'Уже не так'
+        response = anon_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 200, (
+            'Проверьте, что правка отзыва сдвигает Last-Modified'
+        )
+
+    def test_comments_if_modified_since(self, anon_client, review, user):
+        from reviews.models import Comment
+
+        Comment.objects.create(review=review, author=user, text='Да')
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/')
+        response = anon_client.get(url)
+        response = anon_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == 304
+
+    def test_cursor_mode_skips_collection_aggregate(self, anon_client,
+                                                    review, user):
+        from reviews.models import Comment
+
+        Comment.objects.create(review=review, author=user, text='Да')
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/?pagination=cursor')
+        with CaptureQueriesContext(connection) as context:
+            response = anon_client.get(url)
+        assert response.status_code == 200
+        assert not any('COUNT(' in query['sql'] or 'MAX(' in query['sql']
+                       for query in context.captured_queries), (
+            'Проверьте, что в курсорном режиме ETag не считается '
+            'агрегатом по всем комментариям'
+        )
+        etag = response['ETag']
+        response = anon_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        Comment.objects.create(review=review, author=user, text='Нет')
+        response = anon_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data['results']) == 2
+
+    def test_titles_not_modified(self, anon_client, title):
+        response = anon_client.get('/api/v1/titles/')
+        response = anon_client.get('/api/v1/titles/',
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 304
@@ -0,0 +1,58 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+class TestPersistentConnections:
+
+    def test_settings(self):
+        from django.conf import settings
+
+        database = settings.DATABASES['default']
+        assert database['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что соединения с базой постоянные'
+        )
+        assert 'CONN_HEALTH_CHECKS' in database
+        assert 'DISABLE_SERVER_SIDE_CURSORS' in database
+
+    @pytest.mark.django_db(transaction=True)
+    def test_health_check_is_lazy(self, monkeypatch):
+        from django.core.signals import request_finished, request_started
+        from django.db import connection
+        from reviews.models import Title
+
+        connection.ensure_connection()
+        checks = []
+        closed = []
+        monkeypatch.setattr(connection, 'is_usable',
+                            lambda: checks.append(True) and False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+
+        request_started.send(sender=self.__class__)
+        request_finished.send(sender=self.__class__)
+        request_started.send(sender=self.__class__)
+        assert not checks, (
+            'Проверьте, что соединение не проверяется до обращения к базе'
+        )
+        Title.objects.count()
+        Title.objects.count()
+        assert len(checks) == 1, (
+            'Проверьте, что соединение проверяется один раз за запрос'
+        )
+        assert closed, (
+            'Проверьте, что разорванное соединение закрывается до запроса'
+        )
+
+        monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECKS',
+                            False)
+        request_started.send(sender=self.__class__)
+        Title.objects.count()
+        assert len(checks) == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_connections', '--requests', '5', stdout=out)
+        assert 'CONN_MAX_AGE=0' in out.getvalue()
+        assert 'CONN_MAX_AGE=60' in out.getvalue()
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestTitleExport:
+    url = '/api/v1/titles/export/'
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export(self, admin_client, title, review):
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        assert response.streaming, 'Проверьте, что выгрузка потоковая'
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        assert rows == [{
+            'id': title.id, 'name': title.name, 'year': title.year,
+            'description': title.description, 'category': 'films',
+            'genre': ['comedy', 'drama'], 'rating': 10.0,
+        }]
+
+    def test_csv_export(self, admin_client, title):
+        response = admin_client.get(self.url, {'output': 'csv'})
+        lines = self.read(response).splitlines()
+        assert lines[0] == 'id,name,year,description,category,genre,rating'
+        assert lines[1].endswith('films,"comedy,drama",')
+
+    def test_export_is_admin_only(self, user_client, anon_client):
+        assert user_client.get(self.url).status_code == 403
+        assert anon_client.get(self.url).status_code == 401
+
+    def test_export_command(self, title, tmp_path):
+        path = tmp_path / 'titles.ndjson'
+        call_command('export_titles', '--chunk-size', '1',
+                     '--file', str(path))
+        row = json.loads(path.read_text(encoding='utf-8'))
+        assert row['genre'] == ['comedy', 'drama']
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+
+
+def explain(params):
+    from api.filters import TitleFilter
+    from reviews.models import Title
+
+    if connection.vendor == 'postgresql':
+        # На пустых таблицах планировщик выбрал бы seq scan.
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+    return TitleFilter(params, queryset=Title.objects.all()).qs.explain()
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    def test_filters(self, anon_client, title):
+        url = '/api/v1/titles/'
+        cases = (
+            ({'category': 'films'}, 1),
+            ({'category': 'film'}, 0),
+            ({'genre': 'drama'}, 1),
+            ({'genre': 'dram'}, 0),
+            ({'year': 1994}, 1),
+            ({'year': 199}, 0),
+            ({'year_min': 1990, 'year_max': 1994}, 1),
+            ({'year_min': 1995}, 0),
+            ({'name': 'Шоушен'}, 1),
+        )
+        for params, count in cases:
+            response = anon_client.get(url, params)
+            assert response.data['count'] == count, (
+                f'Проверьте фильтрацию произведений по {params}'
+            )
+
+    @pytest.mark.parametrize('params, index', (
+        ({'category': 'films'}, 'category'),
+        ({'genre': 'drama'}, 'genre'),
+        ({'year_min': 1990, 'year_max': 2000}, 'year'),
+    ))
+    def test_filters_use_indexes(self, params, index):
+        plan = explain(params).lower()
+        assert 'index' in plan and index in plan, (
+            f'Проверьте, что фильтр {params} использует индекс:\n{plan}'
+        )
+
+    def test_name_search_uses_trigram_index(self):
+        if connection.vendor != 'postgresql':
+            pytest.skip('Триграммный индекс есть только в PostgreSQL')
+        plan = explain({'name': 'шоушен'})
+        assert 'reviews_title_name_trgm' in plan
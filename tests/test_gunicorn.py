@@ -0,0 +1,56 @@
+import runpy
+from io import StringIO
+from os.path import join
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+
+
+def load_config():
+    return runpy.run_path(join(settings.BASE_DIR, 'gunicorn.conf.py'))
+
+
+class TestGunicornConfig:
+
+    def test_defaults(self, monkeypatch):
+        monkeypatch.setattr('multiprocessing.cpu_count', lambda: 2)
+        config = load_config()
+        assert config['workers'] == 5
+        assert config['worker_class'] == 'gthread'
+        assert config['preload_app'] is True
+        assert config['max_requests_jitter'] > 0
+        assert config['keepalive'] > 60, (
+            'Проверьте, что keepalive gunicorn дольше, чем у nginx'
+        )
+
+    def test_env(self, monkeypatch):
+        monkeypatch.setenv('GUNICORN_WORKERS', '3')
+        monkeypatch.setenv('GUNICORN_THREADS', '1')
+        monkeypatch.setenv('GUNICORN_PRELOAD', 'false')
+        config = load_config()
+        assert config['workers'] == 3
+        assert config['worker_class'] == 'sync'
+        assert config['preload_app'] is False
+
+
+class TestLoadTest:
+
+    def test_wrong_url(self):
+        with pytest.raises(CommandError):
+            call_command('loadtest', 'https://localhost/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_report(self, live_server):
+        out = StringIO()
+        call_command('loadtest', f'{live_server.url}/api/v1/unknown/',
+                     '--concurrency', '2', '--duration', '0.3', stdout=out)
+        assert 'запросов/с' in out.getvalue()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_slow_clients_are_not_measured(self, live_server):
+        out = StringIO()
+        call_command('loadtest', f'{live_server.url}/api/v1/unknown/',
+                     '--concurrency', '1', '--duration', '1.2',
+                     '--slow-clients', '2', stdout=out)
+        assert 'запросов/с' in out.getvalue()
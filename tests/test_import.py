@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+def write_csv(path, header, *rows):
+    path.write_text('\n'.join([header, *rows]) + '\n', encoding='utf-8')
+
+
+@pytest.mark.django_db
+class TestImportYamdb:
+
+    def test_import_directory(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        write_csv(tmp_path / 'category.csv', 'id,name,slug', '1,Фильм,films')
+        write_csv(tmp_path / 'genre.csv', 'id,name,slug',
+                  '1,Драма,drama', '2,Комедия,comedy')
+        write_csv(tmp_path / 'titles.csv', 'id,name,year,category',
+                  '1,Побег,1994,films', '2,Без категории,2000,')
+        write_csv(tmp_path / 'genre_title.csv', 'title,genre',
+                  '1,drama', '1,comedy', '2,drama')
+        write_csv(tmp_path / 'users.csv', 'id,username,email,role',
+                  '1,reader,reader@yamdb.fake,user',
+                  '2,critic,critic@yamdb.fake,moderator')
+        reviews = (
+            {'id': 1, 'title': 1, 'author': 'reader', 'text': 'Да',
+             'score': 8, 'pub_date': '2020-01-01T10:00:00Z'},
+            {'id': 2, 'title': 1, 'author': 'critic', 'text': 'Нет',
+             'score': 4, 'pub_date': '2020-01-02T10:00:00Z'},
+        )
+        (tmp_path / 'review.jsonl').write_text(
+            '\n'.join(json.dumps(row) for row in reviews), encoding='utf-8'
+        )
+        write_csv(tmp_path / 'comments.csv', 'review,author,text',
+                  '1,critic,Согласен')
+
+        call_command('import_yamdb', str(tmp_path), '--batch-size', '1')
+
+        title = Title.objects.get(pk=1)
+        assert title.category.slug == 'films'
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'drama', 'comedy'
+        }
+        assert Title.objects.get(pk=2).category is None
+        review = Review.objects.get(pk=1)
+        assert review.author.username == 'reader'
+        assert review.pub_date.year == 2020, (
+            'Проверьте, что дата отзыва берётся из файла'
+        )
+        assert (title.rating_sum, title.rating_count) == (12, 2), (
+            'Проверьте, что после импорта отзывов рейтинги пересчитаны'
+        )
+        assert Comment.objects.get().author.username == 'critic'
+
+    def test_unknown_slug_is_reported(self, tmp_path):
+        write_csv(tmp_path / 'titles.csv', 'name,year,category',
+                  'Побег,1994,missing')
+        with pytest.raises(CommandError):
+            call_command('import_yamdb', str(tmp_path))
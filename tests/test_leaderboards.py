@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+class TestLeaderboards:
+
+    @pytest.fixture
+    def catalog(self, category, genres, django_user_model):
+        from reviews.models import Category, Review, Title
+
+        books = Category.objects.create(name='Книга', slug='books')
+        titles = {
+            name: Title.objects.create(name=name, year=2000,
+                                       category=category_)
+            for name, category_ in (('Шедевр', category),
+                                    ('Один голос', category),
+                                    ('Середняк', books))
+        }
+        titles['Шедевр'].genre.set(genres[:1])
+        scores = {'Шедевр': [9] * 20, 'Один голос': [10],
+                  'Середняк': [6] * 30}
+        for name, values in scores.items():
+            for number, score in enumerate(values):
+                author, _ = django_user_model.objects.get_or_create(
+                    username=f'critic{number}',
+                    email=f'critic{number}@yamdb.fake')
+                Review.objects.create(title=titles[name], author=author,
+                                      text='Отзыв', score=score)
+        Review.objects.filter(title=titles['Середняк']).update(
+            pub_date=timezone.now() - timedelta(days=30))
+        call_command('refresh_leaderboards')
+        return titles
+
+    def names(self, response):
+        assert response.status_code == 200
+        return [item['name'] for item in response.data]
+
+    def test_top_uses_weighted_average(self, anon_client, catalog):
+        response = anon_client.get('/api/v1/titles/top/')
+        assert self.names(response) == ['Шедевр', 'Один голос',
+                                         'Середняк'], (
+            'Проверьте, что одна высокая оценка не выводит произведение '
+            'на первое место'
+        )
+        assert response.data[0]['score'] < 9
+
+    def test_top_filters(self, anon_client, catalog):
+        url = '/api/v1/titles/top/'
+        assert self.names(anon_client.get(url, {'category': 'books'})) == [
+            'Середняк']
+        assert self.names(anon_client.get(url, {'genre': 'drama'})) == [
+            'Шедевр']
+        assert len(anon_client.get(url, {'limit': 2}).data) == 2
+
+    def test_trending_counts_recent_reviews(self, anon_client, catalog):
+        response = anon_client.get('/api/v1/titles/trending/')
+        assert self.names(response) == ['Шедевр', 'Один голос'], (
+            'Проверьте, что старые отзывы не попадают в популярное'
+        )
+        assert response.data[0]['score'] == 20
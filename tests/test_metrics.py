@@ -0,0 +1,104 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    from api import metrics
+
+    registry = metrics.Registry(worker='web:1')
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
+
+
+def scrape(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
+    return response.content.decode()
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_endpoint_metrics(self, admin_client, anon_client, title,
+                              registry):
+        admin_client.get('/api/v1/titles/')
+        admin_client.get(f'/api/v1/titles/{title.id}/')
+        text = scrape(anon_client)
+        for name in ('yamdb_request_duration_seconds', 'yamdb_db_queries',
+                     'yamdb_db_duration_seconds',
+                     'yamdb_serialize_duration_seconds',
+                     'yamdb_render_duration_seconds'):
+            assert f'# TYPE {name} histogram' in text
+            assert (f'{name}_count{{endpoint="TitleViewSet.list",'
+                    f'worker="web:1"}} 1') in text, (
+                'Проверьте, что метрики собираются по view и действию'
+            )
+        assert 'endpoint="TitleViewSet.retrieve"' in text
+        assert ('yamdb_responses_total{endpoint="TitleViewSet.list",'
+                'status="200",worker="web:1"} 1') in text
+        assert 'yamdb_db_queries_bucket{endpoint="TitleViewSet.list",' \
+               'worker="web:1",le="+Inf"} 1' in text
+
+    def test_workers_are_separate_series(self, anon_client, registry):
+        from api.metrics import Registry
+
+        registry.observe('GenreViewSet.list', 200, {})
+        other = Registry(worker='web:2')
+        for _ in range(2):
+            other.observe('GenreViewSet.list', 200, {})
+        other.flush(force=True)
+        text = scrape(anon_client)
+        for worker, count in (('web:1', 1), ('web:2', 2)):
+            assert ('yamdb_responses_total{endpoint="GenreViewSet.list",'
+                    f'status="200",worker="{worker}"}} {count}') in text, (
+                'Проверьте, что каждый воркер отдаёт свою серию с меткой '
+                'worker, без суммирования в приложении'
+            )
+
+    def test_worker_registration_waits_for_lock(self, registry):
+        from api.cache import get_cache
+        from api.metrics import WORKERS_KEY, WORKERS_LOCK_KEY
+
+        cache = get_cache()
+        cache.set(WORKERS_LOCK_KEY, True)
+        registry.flush(force=True)
+        assert 'web:1' not in cache.get(WORKERS_KEY, {}), (
+            'Проверьте, что список воркеров меняется только под блокировкой'
+        )
+        cache.delete(WORKERS_LOCK_KEY)
+        registry.flush(force=True)
+        assert 'web:1' in cache.get(WORKERS_KEY)
+
+    def test_query_count(self, admin_client, registry):
+        from api.metrics import HISTOGRAMS
+
+        admin_client.get('/api/v1/genres/')
+        histogram = registry.histograms['GenreViewSet.list'][
+            'yamdb_db_queries']
+        buckets = HISTOGRAMS['yamdb_db_queries'][1]
+        assert sum(histogram[:-1]) == 1
+        assert histogram[buckets.index(2)] == 1, (
+            'Проверьте, что считаются SQL-запросы обработки'
+        )
+
+    def test_serialization_time(self, admin_client, title, registry):
+        response = admin_client.get('/api/v1/titles/')
+        assert response.data['results'][0]['name'] == title.name
+        histograms = registry.histograms['TitleViewSet.list']
+        assert histograms['yamdb_serialize_duration_seconds'][-1] > 0, (
+            'Проверьте, что засекается сериализация данных во view, '
+            'а не только рендеринг JSON'
+        )
+
+    def test_slow_request_log(self, admin_client, title, registry, settings,
+                              caplog):
+        settings.SLOW_REQUEST_THRESHOLD = 0
+        with caplog.at_level(logging.WARNING, logger='api.metrics'):
+            admin_client.get('/api/v1/titles/')
+        assert 'TitleViewSet.list' in caplog.text
+        assert 'SELECT' in caplog.text, (
+            'Проверьте, что медленный запрос пишется в журнал с SQL'
+        )
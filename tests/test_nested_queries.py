@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Запросы с JWT-аутентификацией, без SAVEPOINT/RELEASE.
+REVIEW_QUERIES = {
+    'list': ('get', False, None, 5),
+    'retrieve': ('get', True, None, 3),
+    'create': ('post', False, {'text': 'Ещё', 'score': 3}, 4),
+    'partial_update': ('patch', True, {'score': 4}, 5),
+    'destroy': ('delete', True, None, 6),
+}
+COMMENT_QUERIES = {
+    'list': ('get', False, None, 5),
+    'retrieve': ('get', True, None, 3),
+    'create': ('post', False, {'text': 'Ещё'}, 3),
+    'partial_update': ('patch', True, {'text': 'Правка'}, 4),
+    'destroy': ('delete', True, None, 4),
+}
+
+
+def count_queries(client, method, url, data):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data)
+    assert response.status_code < 300, response.data
+    return len([
+        query for query in context.captured_queries
+        if 'SAVEPOINT' not in query['sql']
+    ])
+
+
+@pytest.fixture
+def comment(review, user):
+    from reviews.models import Comment
+
+    return Comment.objects.create(review=review, author=user, text='Да')
+
+
+@pytest.mark.django_db
+class TestNestedQueries:
+
+    @pytest.mark.parametrize('action', REVIEW_QUERIES)
+    def test_review_queries(self, action, user_client, another_user_client,
+                            title, review):
+        method, detail, data, expected = REVIEW_QUERIES[action]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        client = user_client
+        if detail:
+            url = f'{url}{review.id}/'
+        elif method == 'post':
+            client = another_user_client
+        assert count_queries(client, method, url, data) == expected, (
+            f'Проверьте число запросов для отзывов: {action}'
+        )
+
+    @pytest.mark.parametrize('action', COMMENT_QUERIES)
+    def test_comment_queries(self, action, user_client, title, review,
+                             comment):
+        method, detail, data, expected = COMMENT_QUERIES[action]
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        if detail:
+            url = f'{url}{comment.id}/'
+        assert count_queries(user_client, method, url, data) == expected, (
+            f'Проверьте число запросов для комментариев: {action}'
+        )
+
+
+@pytest.mark.django_db
+class TestNestedParents:
+
+    def test_duplicate_review_uses_constraint(self, user_client, title,
+                                              review):
+        from reviews.models import Review
+
+        response = user_client.post(f'/api/v1/titles/{title.id}/reviews/',
+                                    {'text': 'Повтор', 'score': 1})
+        assert response.status_code == 400
+        assert Review.objects.count() == 1
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (10, 1)
+
+    def test_comments_of_review_from_other_title(self, anon_client, review,
+                                                 comment, category):
+        from reviews.models import Title
+
+        other = Title.objects.create(name='Другое', year=2001,
+                                     category=category)
+        response = anon_client.get(
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв ищется только среди отзывов произведения'
+        )
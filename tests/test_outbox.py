@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def test_signup_queues_email(self, anon_client):
+        from users.models import OutboxEmail
+
+        response = anon_client.post('/api/v1/auth/signup/', {
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'
+        })
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в запросе'
+        )
+        assert OutboxEmail.objects.filter(
+            recipient='newcomer@yamdb.fake', sent_at__isnull=True
+        ).exists()
+
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newcomer@yamdb.fake']
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+        assert not OutboxEmail.objects.exclude(body='').exists(), (
+            'Проверьте, что после отправки код не хранится в очереди'
+        )
+
+    def test_failed_email_is_retried_later(self):
+        from users.models import OutboxEmail
+        from users.outbox import enqueue_email, send_pending
+
+        email = enqueue_email('Тема', 'Текст', 'admin@admin.org',
+                              'user@yamdb.fake')
+        with mock.patch('django.core.mail.EmailMessage.send',
+                        side_effect=OSError('smtp down')):
+            assert send_pending() == 0
+        email.refresh_from_db()
+        assert email.attempts == 1
+        assert email.last_error == 'smtp down'
+        assert email.sent_at is None
+
+        assert send_pending() == 0, (
+            'Проверьте, что неудачное письмо откладывается'
+        )
+        OutboxEmail.objects.update(send_after=email.created)
+        assert send_pending() == 1
+
+    def test_exhausted_email_body_is_cleared(self):
+        from users.outbox import MAX_ATTEMPTS, enqueue_email, mark_failed
+
+        email = enqueue_email('Тема', 'Код: 123', 'admin@admin.org',
+                              'user@yamdb.fake')
+        for _ in range(MAX_ATTEMPTS):
+            mark_failed(email, OSError('smtp down'))
+        email.refresh_from_db()
+        assert email.body == '', (
+            'Проверьте, что после последней попытки текст письма удаляется'
+        )
+
+    def test_old_emails_are_purged(self, settings):
+        from django.utils import timezone
+        from users.models import OutboxEmail
+        from users.outbox import enqueue_email
+
+        old = enqueue_email('Тема', 'Текст', 'admin@admin.org',
+                            'old@yamdb.fake')
+        enqueue_email('Тема', 'Текст', 'admin@admin.org', 'new@yamdb.fake')
+        OutboxEmail.objects.filter(pk=old.pk).update(
+            created=timezone.now() - settings.OUTBOX_RETENTION * 2,
+            sent_at=timezone.now() - settings.OUTBOX_RETENTION * 2
+        )
+        with mock.patch('django.core.mail.EmailMessage.send'):
+            call_command('send_emails', '--once')
+        assert list(OutboxEmail.objects.values_list(
+            'recipient', flat=True)) == ['new@yamdb.fake'], (
+            'Проверьте, что send_emails удаляет письма старше '
+            'OUTBOX_RETENTION'
+        )
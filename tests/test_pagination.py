@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def comments_url(self, review):
+        return (f'/api/v1/titles/{review.title_id}/reviews/'
+                f'{review.id}/comments/')
+
+    def create_comments(self, review, user, amount):
+        from reviews.models import Comment
+
+        for number in range(amount):
+            Comment.objects.create(review=review, author=user,
+                                   text=f'Комментарий {number}')
+
+    def test_page_number_is_default(self, anon_client, review, user):
+        self.create_comments(review, user, 7)
+        response = anon_client.get(self.comments_url(review))
+        assert response.data['count'] == 7
+        assert len(response.data['results']) == 5
+
+    def test_cursor_mode_walks_pages_without_count(self, anon_client,
+                                                   review, user):
+        self.create_comments(review, user, 7)
+        url = f'{self.comments_url(review)}?pagination=cursor&page_size=3'
+        with CaptureQueriesContext(connection) as context:
+            response = anon_client.get(url)
+        assert 'count' not in response.data, (
+            'Проверьте, что курсорная пагинация не считает COUNT(*)'
+        )
+        assert not any('__count' in query['sql']
+                       for query in context.captured_queries)
+        texts = [item['text'] for item in response.data['results']]
+        assert texts == ['Комментарий 0', 'Комментарий 1', 'Комментарий 2']
+
+        seen = list(texts)
+        while response.data['next']:
+            response = anon_client.get(response.data['next'])
+            seen += [item['text'] for item in response.data['results']]
+        assert seen == [f'Комментарий {number}' for number in range(7)], (
+            'Проверьте, что ссылки next проходят все комментарии по порядку'
+        )
+
+    def test_cursor_page_size_is_capped(self, anon_client, title):
+        from api.pagination import MAX_PAGE_SIZE
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=2000)
+            for number in range(MAX_PAGE_SIZE + 5)
+        )
+        response = anon_client.get(
+            '/api/v1/titles/?pagination=cursor&page_size=1000'
+        )
+        assert len(response.data['results']) == MAX_PAGE_SIZE
+
+    def test_cursor_walks_tied_values_past_offset_cutoff(self, anon_client):
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=2000)
+            for number in range(1250)
+        )
+        expected = list(Title.objects.order_by('id').values_list(
+            'id', flat=True))
+        response = anon_client.get(
+            '/api/v1/titles/?pagination=cursor&page_size=100'
+        )
+        pages = [[item['id'] for item in response.data['results']]]
+        while response.data['next']:
+            response = anon_client.get(response.data['next'])
+            pages.append([item['id'] for item in response.data['results']])
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсор учитывает id при равных значениях '
+            'поля сортировки и проходит все записи без повторов'
+        )
+
+        backwards = [pages[-1]]
+        while response.data['previous']:
+            response = anon_client.get(response.data['previous'])
+            backwards.append(
+                [item['id'] for item in response.data['results']])
+        assert backwards == pages[::-1], (
+            'Проверьте, что ссылки previous возвращают те же страницы'
+        )
+
+    def test_invalid_cursor(self, anon_client, title):
+        response = anon_client.get('/api/v1/titles/?cursor=bm9wZQ==')
+        assert response.status_code == 404
@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def reviews_url(self, title):
+        return f'/api/v1/titles/{title.id}/reviews/'
+
+    def test_rating_follows_review_writes(self, title, user_client,
+                                          another_user_client):
+        url = self.reviews_url(title)
+        response = user_client.post(url, {'text': 'Хорошо', 'score': 6})
+        assert response.status_code == 201
+        another_user_client.post(url, {'text': 'Плохо', 'score': 2})
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (8, 2), (
+            'Проверьте, что создание отзыва обновляет рейтинг произведения'
+        )
+
+        review_id = response.data['id']
+        user_client.patch(f'{url}{review_id}/', {'score': 10})
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (12, 2), (
+            'Проверьте, что правка оценки сдвигает рейтинг произведения'
+        )
+
+        user_client.delete(f'{url}{review_id}/')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (2, 1), (
+            'Проверьте, что удаление отзыва обновляет рейтинг произведения'
+        )
+        assert title.rating == 2
+
+    @pytest.mark.parametrize('action', ['partial_update', 'destroy'])
+    def test_edited_review_is_locked(self, title, action):
+        from api.views import ReviewViewSet
+
+        view = ReviewViewSet(action=action, kwargs={'title_id': title.id})
+        query = view.get_queryset().query
+        assert query.select_for_update, (
+            'Проверьте, что правка отзыва блокирует его строку до сдвига '
+            'рейтинга'
+        )
+        assert query.select_for_update_of == ('self',)
+        view = ReviewViewSet(action='list', kwargs={'title_id': title.id})
+        assert not view.get_queryset().query.select_for_update
+
+    def test_rating_in_title_response(self, title, review, anon_client):
+        response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.data['rating'] == 10
+
+    def test_check_and_rebuild_commands(self, title, review):
+        from reviews.models import Title
+
+        Title.objects.filter(pk=title.pk).update(rating_sum=3, rating_count=5)
+        with pytest.raises(CommandError):
+            call_command('check_ratings')
+        call_command('rebuild_ratings')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (10, 1)
+        call_command('check_ratings')
@@ -0,0 +1,134 @@
+import datetime
+import io
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+orjson = pytest.importorskip('orjson')
+
+SAMPLE = {
+    'created': datetime.datetime(2021, 5, 1, 12, 30, 15, 123456,
+                                 tzinfo=timezone.utc),
+    'naive': datetime.datetime(2021, 5, 1, 12, 30),
+    'date': datetime.date(2021, 5, 1),
+    'time': datetime.time(8, 15, 30, 500),
+    'price': Decimal('12.50'),
+    'rating': 7.5,
+    'title': gettext_lazy('Произведение'),
+    'text': 'строка с разделителями ',
+    'tags': ('a', None, True, 10),
+    'nested': [{'id': 1, 'score': None}],
+}
+
+
+def render(renderer, data, accepted_media_type='application/json'):
+    return renderer.render(data, accepted_media_type, {})
+
+
+class TestFastJSONRenderer:
+
+    def test_same_bytes(self):
+        from api.renderers import FastJSONRenderer
+
+        assert render(FastJSONRenderer(), SAMPLE) == render(
+            JSONRenderer(), SAMPLE
+        ), (
+            'Проверьте, что FastJSONRenderer выдаёт те же байты, '
+            'что и JSONRenderer, для дат, Decimal и ленивых строк'
+        )
+
+    @pytest.mark.parametrize('data', [
+        {1: 'int key'},
+        {'big': 2 ** 70},
+        None,
+    ])
+    def test_unsupported_data_falls_back(self, data):
+        from api.renderers import FastJSONRenderer
+
+        assert render(FastJSONRenderer(), data) == render(
+            JSONRenderer(), data
+        )
+
+    def test_indent(self):
+        from api.renderers import FastJSONRenderer
+
+        media_type = 'application/json; indent=4'
+        assert render(FastJSONRenderer(), SAMPLE, media_type) == render(
+            JSONRenderer(), SAMPLE, media_type
+        )
+
+    def test_without_orjson(self, monkeypatch):
+        from api import renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert render(renderers.FastJSONRenderer(), SAMPLE) == render(
+            JSONRenderer(), SAMPLE
+        ), 'Проверьте, что без orjson рендер идёт через JSONRenderer'
+
+    @pytest.mark.django_db
+    def test_titles_response(self, anon_client, title):
+        from api.renderers import FastJSONRenderer
+
+        response = anon_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert isinstance(response.accepted_renderer, FastJSONRenderer), (
+            'Проверьте, что FastJSONRenderer задан в REST_FRAMEWORK'
+        )
+        assert response.content == JSONRenderer().render(response.data)
+
+
+class TestFastJSONParser:
+
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), 'application/json', {})
+
+    def test_same_result(self):
+        from api.parsers import FastJSONParser
+
+        body = JSONRenderer().render(SAMPLE)
+        assert self.parse(FastJSONParser(), body) == self.parse(
+            JSONParser(), body
+        )
+
+    @pytest.mark.parametrize('body', [b'{"text": ', b'', b'\xff'])
+    def test_invalid_json(self, body):
+        from api.parsers import FastJSONParser
+
+        with pytest.raises(ParseError) as fast:
+            self.parse(FastJSONParser(), body)
+        with pytest.raises(ParseError) as default:
+            self.parse(JSONParser(), body)
+        assert str(fast.value) == str(default.value), (
+            'Проверьте, что сообщение об ошибке разбора не изменилось'
+        )
+
+    def test_without_orjson(self, monkeypatch):
+        from api import parsers
+
+        monkeypatch.setattr(parsers, 'orjson', None)
+        assert self.parse(parsers.FastJSONParser(), b'{"a": [1, 2]}') == {
+            'a': [1, 2]
+        }
+
+    @pytest.mark.django_db
+    def test_request_body(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Проза', 'slug': 'prose'},
+            format='json'
+        )
+        assert response.status_code == 201
+        assert response.json() == {'name': 'Проза', 'slug': 'prose'}
+
+
+@pytest.mark.django_db
+def test_benchmark_json(title):
+    out = StringIO()
+    call_command('benchmark_json', '--iterations', '2', stdout=out)
+    assert 'рендер быстрее' in out.getvalue()
@@ -0,0 +1,117 @@
+import pytest
+
+
+@pytest.fixture
+def replica(db, settings):
+    """Отдельная SQLite-база в памяти вместо реплики с той же схемой."""
+    from django.apps import apps
+    from django.db import connections
+
+    connections.databases['replica'] = dict(
+        connections.databases['default'], NAME=':memory:', TEST={})
+    connections.ensure_defaults('replica')
+    connection = connections['replica']
+    with connection.schema_editor() as editor:
+        for model in apps.get_models():
+            if model._meta.app_label in ('reviews', 'users'):
+                editor.create_model(model)
+    settings.DATABASE_REPLICAS = ['replica']
+    yield connection
+    connection.connection.close()
+    del connections.databases['replica']
+    del connections._connections.replica
+
+
+def replicas_caught_up():
+    """Окно после изменения каталога прошло, кеш снова заполняют реплики."""
+    from api.cache import CHANGED_KEY, get_cache
+
+    get_cache().delete(CHANGED_KEY)
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+
+    def test_reads_go_to_replica(self, replica, admin_client, title):
+        from reviews.models import Category
+
+        replicas_caught_up()
+        response = admin_client.get('/api/v1/titles/')
+        assert response.data['count'] == 0, (
+            'Проверьте, что чтение произведений идёт с реплики'
+        )
+        Category.objects.using('replica').create(name='Книги', slug='books')
+        replicas_caught_up()
+        response = admin_client.get('/api/v1/categories/')
+        assert [item['slug'] for item in response.data['results']] == [
+            'books']
+        assert not Category.objects.filter(slug='books').exists()
+
+    def test_writes_pin_to_primary(self, replica, admin_client, title,
+                                   anon_client):
+        response = admin_client.post('/api/v1/genres/',
+                                     {'name': 'Ужасы', 'slug': 'horror'})
+        assert response.status_code == 201
+        assert admin_client.get('/api/v1/titles/').data['count'] == 1, (
+            'Проверьте, что после записи клиент читает с основной базы'
+        )
+        # Отзывы не кешируются: другой клиент читает их с реплики,
+        # где произведения нет.
+        response = anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cache_is_filled_from_primary_after_change(
+            self, replica, admin_client, anon_client, title):
+        response = admin_client.post('/api/v1/genres/',
+                                     {'name': 'Ужасы', 'slug': 'horror'})
+        assert response.status_code == 201
+        for _ in range(2):
+            response = anon_client.get('/api/v1/titles/')
+            assert response.data['count'] == 1, (
+                'Проверьте, что кеш каталога после изменения заполняется '
+                'с основной базы, а не с отстающей реплики'
+            )
+
+    def test_cache_miss_reads_replica_without_changes(
+            self, replica, anon_client, title):
+        replicas_caught_up()
+        assert anon_client.get('/api/v1/titles/').data['count'] == 0
+
+    def test_without_replicas(self, admin_client, title, monkeypatch):
+        from api import mixins
+
+        def is_pinned(request):
+            raise AssertionError('Без реплик закрепление не проверяется')
+
+        monkeypatch.setattr(mixins, 'is_pinned', is_pinned)
+        assert admin_client.get('/api/v1/titles/').data['count'] == 1
+
+    def test_pin_key_ignores_spoofed_forwarded_for(self, rf):
+        from api.routers import pin_key
+        from django.contrib.auth.models import AnonymousUser
+
+        keys = set()
+        for spoofed in ('10.0.0.1', '10.0.0.2'):
+            request = rf.get('/', HTTP_X_FORWARDED_FOR=(
+                f'{spoofed}, 203.0.113.5'))
+            request.user = AnonymousUser()
+            keys.add(pin_key(request))
+        assert keys == {'replica:pin:ip:203.0.113.5'}, (
+            'Проверьте, что закрепление анонима идёт по адресу, '
+            'который добавил nginx'
+        )
+
+    def test_router(self, settings):
+        from api.routers import ReplicaRouter, use_primary, use_replica
+        from reviews.models import Title
+
+        settings.DATABASE_REPLICAS = ['replica_1', 'replica_2']
+        router = ReplicaRouter()
+        use_replica()
+        assert router.db_for_read(Title) in settings.DATABASE_REPLICAS
+        assert router.db_for_write(Title) is None
+        use_primary()
+        assert router.db_for_read(Title) is None
+        assert router.allow_migrate('replica_1', 'reviews') is False
+        assert router.allow_migrate('default', 'reviews') is None
@@ -0,0 +1,53 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+    url = '/api/v1/titles/search/'
+
+    def test_search_ranks_title_matches_first(self, anon_client, title,
+                                              category, user):
+        from reviews.models import Review, Title
+
+        other = Title.objects.create(name='Зелёная миля', year=1999,
+                                     category=category)
+        Review.objects.create(title=other, author=user, score=9,
+                              text='Почти как побег из Шоушенка')
+        response = anon_client.get(self.url, {'q': 'Шоушенка'})
+        assert response.status_code == 200
+        names = [item['name'] for item in response.data['results']]
+        assert 'Зелёная миля' in names, (
+            'Проверьте, что поиск учитывает текст отзывов'
+        )
+        response = anon_client.get(self.url, {'q': 'миля'})
+        assert [item['name'] for item in response.data['results']] == [
+            'Зелёная миля'
+        ]
+
+    def test_search_sees_new_titles(self, anon_client, title):
+        from reviews.models import Title
+
+        anon_client.get(self.url, {'q': 'Фильм'})
+        Title.objects.create(name='Новинка', year=2020)
+        response = anon_client.get(self.url, {'q': 'новинка'})
+        assert response.data['count'] == 1, (
+            'Проверьте, что индекс поиска обновляется при сохранении'
+        )
+
+    def test_search_vector_is_not_serialized(self, anon_client, review):
+        response = anon_client.get(
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        )
+        assert 'search_vector' not in response.data, (
+            'Проверьте, что поисковый вектор не попадает в ответ API'
+        )
+        response = anon_client.get(f'/api/v1/titles/{review.title_id}/')
+        assert 'search_vector' not in response.data
+
+    def test_empty_query(self, anon_client):
+        assert anon_client.get(self.url).status_code == 400
+
+    def test_benchmark_command(self, title, capsys):
+        call_command('benchmark_search', 'Фильм', '--repeat', '2')
+        assert 'icontains' in capsys.readouterr().out
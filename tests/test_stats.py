@@ -0,0 +1,42 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestTitleStats:
+
+    def test_stats(self, anon_client, title, django_user_model):
+        from reviews.models import Review
+
+        for number, score in enumerate((10, 8, 8, 3)):
+            author = django_user_model.objects.create(
+                username=f'critic{number}',
+                email=f'critic{number}@yamdb.fake')
+            Review.objects.create(title=title, author=author, text='Да',
+                                  score=score)
+        url = f'/api/v1/titles/{title.id}/stats/'
+        with CaptureQueriesContext(connection) as context:
+            response = anon_client.get(url)
+        assert response.status_code == 200
+        assert len(context) == 2, (
+            'Проверьте, что распределение считается одним запросом'
+        )
+        assert response.data['count'] == 4
+        assert response.data['mean'] == 7.25
+        assert response.data['median'] == 8
+        assert response.data['histogram'][8] == 2
+        assert response.data['histogram'][1] == 0
+
+        with CaptureQueriesContext(connection) as context:
+            anon_client.get(url)
+        assert len(context) == 0, 'Проверьте, что статистика кешируется'
+
+    def test_empty_stats(self, anon_client, title):
+        response = anon_client.get(f'/api/v1/titles/{title.id}/stats/')
+        assert response.data['count'] == 0
+        assert response.data['median'] is None
+
+    def test_missing_title(self, anon_client):
+        assert anon_client.get('/api/v1/titles/100500/stats/').status_code \
+            == 404
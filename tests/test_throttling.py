@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    from api.throttling import TokenBucketThrottle
+
+    def set_rate(scope, rate):
+        monkeypatch.setitem(TokenBucketThrottle.THROTTLE_RATES, scope, rate)
+
+    return set_rate
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from api.throttling import TokenBucketThrottle
+
+    now = [1000.0]
+    monkeypatch.setattr(TokenBucketThrottle, 'timer', lambda self: now[0])
+    return now
+
+
+def sign_up(client, username):
+    return client.post('/api/v1/auth/signup/', {
+        'username': username, 'email': f'{username}@yamdb.fake'
+    })
+
+
+@pytest.mark.django_db
+class TestTokenBucket:
+
+    def test_signup_throttled_before_db(self, anon_client, rates, clock):
+        rates('auth', '2/min')
+        assert sign_up(anon_client, 'first').status_code == 200
+        assert sign_up(anon_client, 'second').status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            response = sign_up(anon_client, 'third')
+        assert response.status_code == 429
+        assert response['Retry-After'] == '30', (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After'
+        )
+        assert len(context) == 0, (
+            'Проверьте, что ограничение срабатывает до запросов к базе'
+        )
+        clock[0] += 30
+        assert sign_up(anon_client, 'third').status_code == 200, (
+            'Проверьте, что корзина пополняется со временем'
+        )
+
+    def test_spoofed_forwarded_for_shares_bucket(self, anon_client, rates):
+        rates('auth', '1/min')
+        # nginx дописывает реальный адрес клиента в конец заголовка.
+        response = anon_client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'first', 'email': 'first@yamdb.fake'},
+            HTTP_X_FORWARDED_FOR='10.0.0.1, 203.0.113.5'
+        )
+        assert response.status_code == 200
+        response = anon_client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'second', 'email': 'second@yamdb.fake'},
+            HTTP_X_FORWARDED_FOR='10.0.0.2, 203.0.113.5'
+        )
+        assert response.status_code == 429, (
+            'Проверьте, что подделанный X-Forwarded-For не даёт новую корзину'
+        )
+        response = anon_client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'third', 'email': 'third@yamdb.fake'},
+            HTTP_X_FORWARDED_FOR='198.51.100.7'
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что клиенты за nginx различаются по своему адресу'
+        )
+
+    def test_writes_and_reads_limited_separately(self, user_client, title,
+                                                 rates):
+        rates('write', '1/min')
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, {'text': 'Да', 'score': 5})
+        assert response.status_code == 201
+        response = user_client.post(url, {'text': 'Нет', 'score': 1})
+        assert response.status_code == 429
+        assert user_client.get(url).status_code == 200
+
+    def test_read_limit(self, anon_client, rates):
+        rates('read', '2/min')
+        for _ in range(2):
+            assert anon_client.get('/api/v1/genres/').status_code == 200
+        assert anon_client.get('/api/v1/genres/').status_code == 429
+
+    def test_fallback_to_local_memory(self, anon_client, rates, settings):
+        from api.throttling import local_cache
+
+        local_cache.clear()
+        settings.THROTTLE_CACHE_ALIAS = 'missing'
+        rates('read', '1/min')
+        assert anon_client.get('/api/v1/genres/').status_code == 200
+        assert anon_client.get('/api/v1/genres/').status_code == 429
+        local_cache.clear()
@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+TITLE_LIST_QUERIES = 3
+TITLE_DETAIL_QUERIES = 2
+
+
+@pytest.mark.django_db
+class TestTitleQueries:
+
+    def create_titles(self, category, genres, amount):
+        from reviews.models import Title
+
+        for number in range(amount):
+            title = Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        return len(context)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_title_list_queries_do_not_grow(self, anon_client, category,
+                                            genres):
+        url = '/api/v1/titles/'
+        self.create_titles(category, genres, 1)
+        assert self.count_queries(anon_client, url) == TITLE_LIST_QUERIES, (
+            'Проверьте, что список произведений загружается '
+            f'за {TITLE_LIST_QUERIES} запроса'
+        )
+        self.create_titles(category, genres, 10)
+        assert self.count_queries(anon_client, url) == TITLE_LIST_QUERIES, (
+            'Проверьте, что число запросов списка произведений '
+            'не зависит от размера страницы'
+        )
+
+    def test_title_detail_queries(self, anon_client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        assert self.count_queries(anon_client, url) == TITLE_DETAIL_QUERIES, (
+            'Проверьте, что произведение загружается '
+            f'за {TITLE_DETAIL_QUERIES} запроса'
+        )